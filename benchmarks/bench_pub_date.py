@@ -0,0 +1,35 @@
+"""
+Compares parsing feed publish dates with dateutil against bulletin's DateParser
+
+Run with: python benchmarks/bench_pub_date.py
+"""
+import datetime
+import timeit
+import dateutil.parser
+from bulletin.dates import DateParser
+
+ITEMS = 20000
+START = datetime.datetime(2025, 3, 19, 14, 30, tzinfo=datetime.timezone.utc)
+
+FEEDS = {
+    "rfc822": [(START - datetime.timedelta(minutes=i)).strftime("%a, %d %b %Y %H:%M:%S GMT") for i in range(ITEMS)],
+    "iso8601": [(START - datetime.timedelta(minutes=i)).isoformat() for i in range(ITEMS)],
+}
+
+
+def parse_dateutil(values):
+    for value in values:
+        dateutil.parser.parse(value)
+
+
+def parse_date_parser(values):
+    parser = DateParser()
+    for value in values:
+        parser.parse(value)
+
+
+if __name__ == "__main__":
+    for name, values in FEEDS.items():
+        slow = min(timeit.repeat(lambda: parse_dateutil(values), number=1, repeat=3))
+        fast = min(timeit.repeat(lambda: parse_date_parser(values), number=1, repeat=3))
+        print(f"{name:8} {ITEMS} items  dateutil {slow:.3f}s  DateParser {fast:.3f}s  {slow / fast:.1f}x")
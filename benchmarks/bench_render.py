@@ -0,0 +1,28 @@
+"""
+Measures how many bulletins can be rendered and sent per second with no network access, using a MemoryTransport
+
+Run with: python benchmarks/bench_render.py
+"""
+import time
+from bulletin import Bulletin, MemoryTransport, PlainTextSection, Section
+
+BULLETINS = 2000
+SECTIONS = 5
+
+
+def build(transport):
+    bullet = Bulletin(transport, config={"subject": "Benchmark"})
+    bullet.add_section(PlainTextSection("Welcome to the **benchmark**", encoding="markdown"))
+    for i in range(SECTIONS - 1):
+        bullet.add_section(Section(lambda config: {"index": config["index"]}, {"index": i}))
+    return bullet
+
+
+if __name__ == "__main__":
+    transport = MemoryTransport()
+    bullet = build(transport)
+    start = time.perf_counter()
+    for _ in range(BULLETINS):
+        bullet.send("reader@example.com")
+    elapsed = time.perf_counter() - start
+    print(f"{BULLETINS} bulletins of {SECTIONS} sections in {elapsed:.2f}s, {BULLETINS / elapsed:.0f}/s")
@@ -1,3 +1,9 @@
-from .bulletin import Bulletin
+from .bulletin import Bulletin,BulletinSnapshot
 from .email_server import EmailServer
-from .section import Section,PlainTextSection,IndividualRSSFeed,RequestsGetSection
\ No newline at end of file
+from .transport import Transport,FileTransport,MemoryTransport
+from .section import Section,PlainTextSection,IndividualRSSFeed,RequestsGetSection,FeedItem
+from .fetch import FetchPolicy,TokenBucket,CircuitBreaker,CircuitOpenError,HostError,DEFAULT_FETCH_POLICY
+from .cache import RenderCache
+from .dates import DateParser
+from .send_log import SendLog
+from .streaming import ResponseTooLarge
\ No newline at end of file
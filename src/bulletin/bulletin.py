@@ -1,10 +1,23 @@
 from .section import Section
-from .email_server import EmailServer
+from .transport import Transport
+from .cache import RenderCache
 from typing import Sequence
-from .helpers import get_template
+from types import MappingProxyType
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .helpers import get_template, fingerprint, template_identity
 
 DEFAULT_TEMPLATE_FOLDER = "templates"
 
+def _renders_itself(section: Section) -> bool:
+    """
+    Returns whether a bulletin should get a section's html from its render method, rather than processing and rendering it itself
+
+    True for static sections, and for sections whose class overrides render
+    """
+    return section.static or type(section).render is not Section.render
+
 class Bulletin:
     """
     The base class to define bulletins
@@ -16,41 +29,65 @@ class Bulletin:
 
         default is base.html
 
-    email_server : EmailServer
-        The email server the bulletin should use to send emails
+    email_server : Transport
+        The transport the bulletin should use to send emails. An EmailServer to send over smtp, or a FileTransport or MemoryTransport to send without any network access
 
     config : dict, optional
         The configuration for the Bulletin
+
+        subject is the default subject of the email. name, if given, is how the bulletin is identified in send logs, otherwise the subject is used
     sections: list[Section]
         The sections used in this Bulletin
     template_folder : str
         The template folder where a non-default template is stored
     template : str
         The name of a non-default template file
+    cache : RenderCache | None
+        The cache used to reuse rendered sections, and to skip sending unchanged bulletins
+    fetch_workers : int
+        The number of sections processed at once when rendering. Sections that fetch remote data spend most of their time waiting, so processing them at once is faster
+
+    Thread Safety
+    -----
+    render and send can be called from many threads at once. add_section replaces the sections list rather than changing it,
+    so a render that has started keeps the sections it started with.
+    With a cache, sends of the bulletin to the same recipients wait for each other, so skip_unchanged sends a bulletin once however many threads send it.
+
+    To share one bulletin between threads without it changing, use snapshot. It returns a BulletinSnapshot, a copy whose sections and config can't be changed.
+    Snapshots share the original's sections, cache and transport, so creating one copies no data and they stay warm between renders
     """
     default_template: str = "base.html"
     def __init__(self,
-                 email_server:EmailServer,
+                 email_server:Transport,
                  config:dict={"subject":"Bulletin"},
                  template:str = None, 
-                 template_folder = DEFAULT_TEMPLATE_FOLDER
+                 template_folder = DEFAULT_TEMPLATE_FOLDER,
+                 cache:RenderCache = None,
+                 fetch_workers:int = 1
                  ) -> None:
         """
         Parameters
         -----
-        email_server : EmailServer
-            The email server for the object to use
+        email_server : Transport
+            The transport for the object to use, such as an EmailServer
         config: dict,optional
             The configuration of the object
         template : str, optional
             The name of a template file within the template_folder directory. Will be used in place of the class' default template
         template_folder : str, optional
             The path relative to the current working directory where a non-default template is stored.
+        cache : RenderCache, optional
+            A cache of rendered html. Sections whose data and template have not changed since they were last rendered will not be rendered again
+        fetch_workers : int, optional
+            The number of sections processed at once when rendering. Default 1
         """
-        self.email_server: EmailServer = email_server
+        self.email_server: Transport = email_server
         self.config:dict = config
         self.sections: list[Section] = []
+        self._lock = threading.Lock()
         self.template_folder = template_folder
+        self.cache:RenderCache | None = cache
+        self.fetch_workers:int = fetch_workers
         if template is not None:
             self.template = template
 
@@ -68,9 +105,21 @@ class Bulletin:
             returns the object's sections attribute after adding a new section
         """
         if isinstance(section,Section):
-            self.sections.append(section)
+            with self._lock:
+                self.sections = self.sections + [section]
         return self.sections
 
+    def snapshot(self) -> "BulletinSnapshot":
+        """
+        Creates an immutable copy of the bulletin to share between threads
+
+        Returns
+        -----
+        BulletinSnapshot
+            A copy with the current sections and config, which can be rendered and sent but not changed
+        """
+        return BulletinSnapshot(self)
+
 
     def render(self) -> str:
         """
@@ -81,12 +130,79 @@ class Bulletin:
         str
             returns the rendered template for the bulletin
         """
-        renders = [section.render() for section in self.sections]
+        return self._render()[0]
+
+    def _process_sections(self, sections: Sequence[Section]) -> list:
+        """
+        Processes every section that is not static and does not override render, using up to fetch_workers threads at once
+
+        Should not be run by the user.
+
+        Parameters
+        -----
+        sections : Sequence[Section]
+            The sections to process
+
+        Returns
+        -----
+        list
+            The output of each section's process function, in the same order as the sections. None for sections that render themselves
+        """
+        def process(section: Section) -> any:
+            return None if _renders_itself(section) else section._process()
+
+        if self.fetch_workers <= 1 or len(sections) <= 1:
+            return [process(section) for section in sections]
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(sections))) as executor:
+            return list(executor.map(process, sections))
+
+    def _render(self) -> tuple[str, str | None]:
+        """
+        Renders the bulletin, using the cache if there is one
+
+        Should not be run by the user.
+
+        Returns
+        -----
+        tuple[str, str | None]
+            The rendered bulletin, and its fingerprint. The fingerprint is None if the bulletin has no cache
+        """
         template = get_template(self)
-        return template.render(content = renders)
+        sections = self.sections
+        processed = self._process_sections(sections)
+        renders = []
+        digest = None
+        if self.cache is not None:
+            digest = hashlib.sha256(template_identity(template).encode())
+        for section, data in zip(sections, processed):
+            if _renders_itself(section):
+                # Static sections are rendered once by the section itself, and sections overriding render must go through it
+                fragment = section.render()
+                if digest is not None:
+                    digest.update(hashlib.sha256(fragment.encode()).hexdigest().encode())
+            elif self.cache is None:
+                fragment = section._render(data)
+            else:
+                section_template = get_template(section)
+                section_fingerprint = fingerprint(data, section_template)
+                digest.update(section_fingerprint.encode())
+                fragment = self.cache.get(section_fingerprint)
+                if fragment is None:
+                    fragment = section_template.render(data=data)
+                    self.cache.set(section_fingerprint, fragment)
+            renders.append(fragment)
+
+        if digest is None:
+            return template.render(content = renders), None
+        bulletin_fingerprint = digest.hexdigest()
+        text = self.cache.get(bulletin_fingerprint)
+        if text is None:
+            text = template.render(content = renders)
+            self.cache.set(bulletin_fingerprint, text)
+        return text, bulletin_fingerprint
 
 
-    def send(self,recepient: str | Sequence[str],subject: str | None = None) -> None:
+    def send(self,recepient: str | Sequence[str],subject: str | None = None,skip_unchanged: bool = False) -> bool:
         """
         Sends the bulletin via email
 
@@ -96,10 +212,61 @@ class Bulletin:
             The address or addresses to send the email too
         subject: str, optional
             Changes the subject of the email to something other than the default defined on object creation
+        skip_unchanged: bool, optional
+            If True, the email is not sent when the bulletin is the same as the last one sent to the recepients. Requires the bulletin to have a cache
+
+            Bulletins sharing a cache and template are told apart by config["name"]
+
+            Changes to templates that are included, imported or extended by a constant name count as changes. Changes to a template chosen by a variable do not
+
+            Default False
+        Returns
+        -----
+        bool
+            True if the email was sent, False if it was skipped because there was no new content
         """
-        text = self.render()
+        if skip_unchanged and self.cache is None:
+            raise ValueError("skip_unchanged requires the bulletin to have a cache")
+        text, bulletin_fingerprint = self._render()
         subj = self.config["subject"]
         if subject is not None:
             subj = subject
-        self.email_server.send(recepient,subj,text)
+        recepients = recepient if isinstance(recepient, str) else ",".join(recepient)
+        # Bulletins can share a cache, so the key identifies the bulletin as well as what was sent and to whom
+        key = f"{self.config.get('name', '')}:{template_identity(get_template(self))}:{subj}:{recepients}"
+        if self.cache is None:
+            self.email_server.send(recepient,subj,text,bulletin=self.config.get("name",subj))
+            return True
+        with self.cache.sending(key):
+            if skip_unchanged and self.cache.last_sent(key) == bulletin_fingerprint:
+                return False
+            self.email_server.send(recepient,subj,text,bulletin=self.config.get("name",subj))
+            self.cache.record_sent(key, bulletin_fingerprint)
+        return True
+
+
+class BulletinSnapshot(Bulletin):
+    """
+    An immutable copy of a Bulletin, created by Bulletin.snapshot
+
+    Its sections are a tuple and its config is read only. Setting attributes or adding sections raises a TypeError,
+    so it can be shared between threads that render and send it without locks
+    """
+    def __init__(self, bulletin: Bulletin) -> None:
+        """
+        Parameters
+        -----
+        bulletin : Bulletin
+            The bulletin to copy
+        """
+        attributes = dict(bulletin.__dict__)
+        attributes["sections"] = tuple(bulletin.sections)
+        attributes["config"] = MappingProxyType(dict(bulletin.config))
+        attributes.pop("_lock", None)
+        self.__dict__.update(attributes)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise TypeError("BulletinSnapshot can't be changed")
 
+    def add_section(self, section: Section) -> list[Section]:
+        raise TypeError("BulletinSnapshot can't be changed, add sections to the original Bulletin")
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """
+    A cache of rendered html, keyed by the fingerprint of the data and template used to render it
+
+    Also remembers the fingerprint of the last bulletin sent to each set of recipients, so unchanged bulletins don't need to be sent again
+
+    A fingerprint covers the templates a template includes, imports or extends by a constant name. A template chosen by a variable,
+    such as {% include name %}, is not covered, so editing it will not replace html already cached
+
+    Attributes
+    -----
+    directory : str | None
+        The directory the cache is stored in. If None, the cache is only kept in memory
+    max_entries : int
+        The maximum number of rendered fragments kept in memory
+    max_disk_entries : int
+        The maximum number of rendered fragments kept in directory. The least recently used are removed first
+
+    Methods
+    -------
+    get(fingerprint: str)
+        Returns the html rendered for a fingerprint, or None if it is not cached
+    set(fingerprint: str, html: str)
+        Stores the html rendered for a fingerprint
+    last_sent(key: str)
+        Returns the fingerprint of the last bulletin sent under the key, or None
+    record_sent(key: str, fingerprint: str)
+        Stores the fingerprint of the bulletin just sent under the key
+    sending(key: str)
+        Returns the lock to hold while checking, sending and recording a bulletin under the key
+    prune()
+        Removes the least recently used fragments from directory until there are at most max_disk_entries
+    """
+    SENT_FILE = "sent.json"
+
+    def __init__(self, directory:str = None, max_entries:int = 1024, max_disk_entries:int = 4096) -> None:
+        """
+        Parameters
+        -----
+        directory : str, optional
+            The directory to store the cache in, so it is kept between runs. Created if it does not exist. Default None, memory only
+        max_entries : int, optional
+            The maximum number of rendered fragments kept in memory. Default 1024
+        max_disk_entries : int, optional
+            The maximum number of rendered fragments kept in directory. Default 4096
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._writes = 0
+        self._fragments:OrderedDict[str,str] = OrderedDict()
+        self._sent:dict[str,str] = {}
+        self._send_locks:dict[str,threading.Lock] = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            sent_path = os.path.join(directory, self.SENT_FILE)
+            if os.path.exists(sent_path):
+                with open(sent_path) as f:
+                    self._sent = json.load(f)
+            self.prune()
+
+    def _path(self, fingerprint:str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.html")
+
+    def get(self, fingerprint:str) -> str | None:
+        """
+        Returns the html rendered for a fingerprint
+
+        Parameters
+        -----
+        fingerprint : str
+            The fingerprint to look up
+        Returns
+        -----
+        str | None
+            The cached html, or None if it is not cached
+        """
+        with self._lock:
+            if fingerprint in self._fragments:
+                self._fragments.move_to_end(fingerprint)
+                return self._fragments[fingerprint]
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(fingerprint), encoding="utf-8") as f:
+                html = f.read()
+        except FileNotFoundError:
+            return None
+        # Marks the fragment as recently used, so prune keeps it
+        try:
+            os.utime(self._path(fingerprint))
+        except FileNotFoundError:
+            pass
+        self._remember(fingerprint, html)
+        return html
+
+    def set(self, fingerprint:str, html:str) -> None:
+        """
+        Stores the html rendered for a fingerprint
+
+        Parameters
+        -----
+        fingerprint : str
+            The fingerprint of the data and template rendered
+        html : str
+            The rendered html
+        """
+        self._remember(fingerprint, html)
+        if self.directory is not None:
+            # Written to a temporary file then moved, so a render in another thread never reads a partly written file
+            tmp_path = f"{self._path(fingerprint)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(html)
+            os.replace(tmp_path, self._path(fingerprint))
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self.max_disk_entries == 0
+            if prune:
+                self.prune()
+
+    def prune(self) -> None:
+        """
+        Removes the least recently used fragments from directory until there are at most max_disk_entries
+        """
+        if self.directory is None:
+            return
+        fragments = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".html") and entry.is_file():
+                    try:
+                        fragments.append((entry.stat().st_mtime_ns, entry.path))
+                    except FileNotFoundError:
+                        continue
+        fragments.sort()
+        for _, path in fragments[:max(0, len(fragments) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, fingerprint:str, html:str) -> None:
+        with self._lock:
+            self._fragments[fingerprint] = html
+            self._fragments.move_to_end(fingerprint)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+    def last_sent(self, key:str) -> str | None:
+        """
+        Returns the fingerprint of the last bulletin sent under the key
+
+        Parameters
+        -----
+        key : str
+            Identifies the bulletin and its recipients
+        Returns
+        -----
+        str | None
+            The fingerprint, or None if nothing has been sent under the key
+        """
+        with self._lock:
+            return self._sent.get(key)
+
+    def sending(self, key:str) -> threading.Lock:
+        """
+        Returns the lock to hold while checking last_sent, sending and calling record_sent for a key
+
+        Holding it makes the three steps one, so threads sending the same bulletin to the same recipients can't all see it as unsent.
+        Sends under different keys don't wait for each other
+
+        Parameters
+        -----
+        key : str
+            Identifies the bulletin and its recipients
+        Returns
+        -----
+        threading.Lock
+            The lock for the key
+        """
+        with self._lock:
+            return self._send_locks.setdefault(key, threading.Lock())
+
+    def record_sent(self, key:str, fingerprint:str) -> None:
+        """
+        Stores the fingerprint of the bulletin just sent under the key
+
+        Parameters
+        -----
+        key : str
+            Identifies the bulletin and its recipients
+        fingerprint : str
+            The fingerprint of the bulletin sent
+        """
+        with self._lock:
+            self._sent[key] = fingerprint
+            if self.directory is not None:
+                sent_path = os.path.join(self.directory, self.SENT_FILE)
+                with open(f"{sent_path}.tmp", "w") as f:
+                    json.dump(self._sent, f)
+                os.replace(f"{sent_path}.tmp", sent_path)
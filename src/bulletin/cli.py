@@ -0,0 +1,202 @@
+import argparse
+import cProfile
+import importlib
+import importlib.util
+import json
+import os
+import pstats
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+from .bulletin import Bulletin, BulletinSnapshot
+from .cache import RenderCache
+from .transport import Transport, FileTransport
+from .send_log import SendLog, report
+
+
+def load_bulletins(definitions:str, attribute:str = "bulletins") -> list[Bulletin]:
+    """
+    Loads bulletins from a python file or module
+
+    Parameters
+    -----
+    definitions : str
+        The path to a python file, or the name of an importable module
+    attribute : str, optional
+        The name of the attribute holding the bulletins. It can be a list of Bulletin, or a function returning one. Default bulletins
+
+        BulletinSnapshots are not allowed, since the run command sets the cache, transport and fetch workers of each bulletin
+    Returns
+    -----
+    list[Bulletin]
+        The bulletins defined
+    """
+    if definitions.endswith(".py") or os.path.isfile(definitions):
+        name = os.path.splitext(os.path.basename(definitions))[0]
+        spec = importlib.util.spec_from_file_location(name, definitions)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(definitions)
+    bulletins = getattr(module, attribute)
+    if callable(bulletins):
+        bulletins = bulletins()
+    bulletins = list(bulletins)
+    for bulletin in bulletins:
+        if not isinstance(bulletin, Bulletin):
+            raise TypeError(f"{definitions}.{attribute} contains {bulletin!r}, which is not a Bulletin")
+        if isinstance(bulletin, BulletinSnapshot):
+            raise TypeError(f"{definitions}.{attribute} contains a BulletinSnapshot, which can't be changed. Use the Bulletin it was taken from")
+    return bulletins
+
+
+def _bulletin_name(bulletin:Bulletin, index:int) -> str:
+    name = bulletin.config.get("name", f"bulletin_{index}")
+    return re.sub(r"[^\w.-]+", "_", str(name))
+
+
+def _run_one(bulletin:Bulletin, index:int, args:argparse.Namespace) -> dict:
+    name = _bulletin_name(bulletin, index)
+    timing = {"bulletin": name, "sent": False, "error": None}
+    start = time.perf_counter()
+    try:
+        if args.dry_run is not None:
+            text = bulletin.render()
+            timing["render"] = time.perf_counter() - start
+            with open(os.path.join(args.dry_run, f"{name}.html"), "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            recipients = bulletin.config.get("recipients")
+            if not recipients:
+                raise ValueError(f"Bulletin {name} has no recipients in its config")
+            timing["sent"] = bulletin.send(recipients, skip_unchanged=args.skip_unchanged)
+    except Exception as e:
+        timing["error"] = f"{e.__class__.__name__}: {e}"
+        traceback.print_exc()
+    finally:
+        timing["total"] = time.perf_counter() - start
+    return timing
+
+
+def _run(args:argparse.Namespace) -> int:
+    bulletins = load_bulletins(args.definitions, args.attribute)
+    cache = RenderCache(args.cache_dir) if args.cache_dir is not None else None
+    send_log = SendLog(args.send_log) if args.send_log is not None else None
+    outboxes = []
+    for bulletin in bulletins:
+        if args.fetch_concurrency is not None:
+            bulletin.fetch_workers = args.fetch_concurrency
+        if cache is not None and bulletin.cache is None:
+            bulletin.cache = cache
+        if args.outbox is not None:
+            outbox = FileTransport(args.outbox, format=args.outbox_format, sender=bulletin.email_server.sender)
+            outboxes.append(outbox)
+            bulletin.email_server = outbox
+        if send_log is not None and isinstance(bulletin.email_server, Transport) and bulletin.email_server.send_log is None:
+            bulletin.email_server.send_log = send_log
+    for directory in [args.dry_run, args.profile]:
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    if args.profile is not None:
+        # Only one profiler can be active at a time, and it only sees its own thread, so profiled runs send bulletins one at a time in this thread
+        if args.workers > 1:
+            print("--profile runs bulletins one at a time, ignoring --workers", file=sys.stderr)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            timings = [_run_one(bulletin, index, args) for index, bulletin in enumerate(bulletins)]
+        finally:
+            profiler.disable()
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            timings = list(executor.map(lambda item: _run_one(item[1], item[0], args), enumerate(bulletins)))
+    for outbox in outboxes:
+        outbox.close()
+    total = time.perf_counter() - start
+
+    if args.profile is not None:
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(os.path.join(args.profile, "profile.pstats"))
+        with open(os.path.join(args.profile, "profile.txt"), "w") as f:
+            stats.stream = f
+            stats.sort_stats("cumulative").print_stats(50)
+        with open(os.path.join(args.profile, "timings.json"), "w") as f:
+            json.dump({"total": total, "bulletins": timings}, f, indent=4)
+
+    failed = [timing for timing in timings if timing["error"] is not None]
+    print(f"{len(timings)} bulletins in {total:.2f}s, {len(failed)} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _report(args:argparse.Namespace) -> int:
+    records = []
+    for path in args.logs:
+        records.extend(SendLog.read(path))
+    if args.run is not None:
+        records = [r for r in records if r["run_id"] == args.run]
+    if args.bulletin is not None:
+        records = [r for r in records if str(r.get("bulletin")) == args.bulletin]
+    if not records:
+        print("No sends recorded", file=sys.stderr)
+        return 1
+    print(report(records))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser for the bulletin command
+
+    Returns
+    -----
+    argparse.ArgumentParser
+        The parser, with a subcommand for each command
+    """
+    parser = argparse.ArgumentParser(prog="bulletin", description="A python framework for generating newsletters")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Render and send bulletins in bulk")
+    run_parser.add_argument("definitions", help="A python file or module defining the bulletins. Each bulletin is sent to the recipients in its config")
+    run_parser.add_argument("--attribute", default="bulletins", help="The name of the list of bulletins, or a function returning one, in the definitions. Default bulletins")
+    run_parser.add_argument("--workers", type=int, default=1, help="The number of bulletins rendered and sent at once. Default 1")
+    run_parser.add_argument("--fetch-concurrency", type=int, help="The number of sections of a bulletin processed at once. Default is the fetch_workers each bulletin was defined with")
+    run_parser.add_argument("--cache-dir", help="A directory to keep rendered sections in between runs")
+    run_parser.add_argument("--skip-unchanged", action="store_true", help="Don't send bulletins that are the same as the last one sent. Requires --cache-dir, where the last sends are remembered")
+    run_parser.add_argument("--send-log", help="A file to record every email sent in")
+    run_parser.add_argument("--dry-run", metavar="DIR", help="Render each bulletin to an html file in DIR instead of sending it")
+    run_parser.add_argument("--outbox", metavar="DIR", help="Send emails to files in DIR instead of over smtp")
+    run_parser.add_argument("--outbox-format", choices=FileTransport.FORMATS, default="eml", help="Write the outbox as .eml files or as a maildir. Default eml")
+    run_parser.add_argument("--profile", metavar="DIR", help="Write cProfile stats and timings for the run to DIR. Bulletins are run one at a time while profiling")
+    run_parser.set_defaults(func=_run)
+
+    report_parser = commands.add_parser("report", help="Summarize the throughput, latency and errors recorded in send logs")
+    report_parser.add_argument("logs", nargs="+", help="The send log files to read")
+    report_parser.add_argument("--run", help="Only report on the run with this id")
+    report_parser.add_argument("--bulletin", help="Only report on the bulletin with this name")
+    report_parser.set_defaults(func=_report)
+    return parser
+
+
+def main(argv:Sequence[str] | None = None) -> int:
+    """
+    Runs the bulletin command
+
+    Parameters
+    -----
+    argv : Sequence[str], optional
+        The command line arguments. Default is sys.argv
+    Returns
+    -----
+    int
+        The exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.skip_unchanged and args.cache_dir is None:
+        parser.error("--skip-unchanged requires --cache-dir, so the last sends are remembered between runs")
+    return args.func(args)
@@ -0,0 +1,86 @@
+import datetime
+import email.utils
+import re
+import dateutil.parser
+
+# parsedate_to_datetime accepts strings that are not RFC 822 and silently drops what it doesn't understand, such as AM/PM
+RFC822_PATTERN = re.compile(r"\s*(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?(?:\s+(?:[A-Za-z]{1,5}|[+-]\d{4}))?\s*")
+
+
+def _parse_rfc822(value:str) -> datetime.datetime:
+    if RFC822_PATTERN.fullmatch(value) is None:
+        raise ValueError(f"{value!r} is not an RFC 822 date")
+    parsed = email.utils.parsedate_to_datetime(value)
+    # parsedate_to_datetime returns a naive datetime for -0000, which feeds use to mean UTC
+    if parsed.tzinfo is None and value.rstrip().endswith("-0000"):
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def _parse_iso8601(value:str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def _parse_dateutil(value:str) -> datetime.datetime:
+    return dateutil.parser.parse(value)
+
+
+class DateParser:
+    """
+    Parses the publish dates of a feed
+
+    A feed uses the same date format for all of its items, so the parser remembers the first format that worked and tries it first for the rest of the feed.
+    The fast standard library parsers for RFC 822 and ISO 8601 are tried before falling back to dateutil, which can parse most other formats but is much slower
+
+    Attributes
+    -----
+    format : str | None
+        The name of the format that last parsed a date, one of "rfc822", "iso8601" or "dateutil". None until a date has been parsed
+
+    Methods
+    -------
+    parse(value: str)
+        Parses a date string into a datetime
+    """
+    FORMATS = {
+        "rfc822": _parse_rfc822,
+        "iso8601": _parse_iso8601,
+        "dateutil": _parse_dateutil,
+    }
+
+    def __init__(self) -> None:
+        self.format:str | None = None
+
+    def parse(self, value:str) -> datetime.datetime:
+        """
+        Parses a date string into a datetime
+
+        Parameters
+        -----
+        value : str
+            The date as given in the feed
+        Returns
+        -----
+        datetime.datetime
+            The parsed date
+        """
+        remembered = self.format
+        if remembered is not None:
+            try:
+                return self.FORMATS[remembered](value)
+            except (TypeError, ValueError, OverflowError) as e:
+                error = e
+        for name, parse_function in self.FORMATS.items():
+            if name == remembered:
+                continue
+            try:
+                parsed = parse_function(value)
+            except (TypeError, ValueError, OverflowError) as e:
+                error = e
+                continue
+            self.format = name
+            return parsed
+        raise error
+
+
+DEFAULT_DATE_PARSER = DateParser()
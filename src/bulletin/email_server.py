@@ -1,29 +1,40 @@
-import email
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import threading
+import time
+from .send_log import SendLog
+from .transport import Transport
 from typing import Sequence
 
-class EmailServer:
+class EmailServer(Transport):
     """
     A class used to create an smtp server connection, then send emails over it.
 
+    The connection is made and logged in to the first time it is used, so creating an EmailServer that is never sent with needs no server.
+
     ...
 
     Attributes
     --------
     server : smtplib.SMTP
-        The smtp server connection
+        The smtp server connection. Connects and logs in when first accessed
     sender : str
         The email used to authenticate with the server. Also used as the sender when sending emails
+    send_log : SendLog | None
+        The log every sent message is recorded in
+    max_retries : int
+        The number of times a message is retried when the server responds with a temporary (4xx) error
+    retry_delay : float
+        The number of seconds waited before the first retry. The wait doubles with each retry after that
 
     Methods
     -------
-    send(send_to: str | Sequence[str], subject: str, text: str)
+    send(send_to: str | Sequence[str], subject: str, text: str, bulletin: str)
         Sends an email to the addresses given, with the given subject and text lines
+    close()
+        Closes the connection to the smtp server
     
     """
-    def __init__(self,auth_user:str,auth_password:str,server:str,port:int=587) -> None:
+    def __init__(self,auth_user:str,auth_password:str,server:str,port:int=587,send_log:SendLog=None,max_retries:int=0,retry_delay:float=1.0) -> None:
         """
         Parameters
         --------
@@ -35,32 +46,64 @@ class EmailServer:
             The smtp server url
         port : int, optional
             The port on which to connect to the smtp server. Default value 587
+        send_log : SendLog, optional
+            A log to record the timing, size and result of every message sent
+        max_retries : int, optional
+            The number of times a message is retried when the server responds with a temporary (4xx) error. Default value 0
+        retry_delay : float, optional
+            The number of seconds waited before the first retry, doubled for each retry after that. Default value 1
         """
-        self.server:smtplib.SMTP = smtplib.SMTP(server,port)
-        self.sender:str = auth_user
-        self.server.starttls()
-        self.server.login(auth_user,auth_password)
+        super().__init__(auth_user,send_log)
+        self.max_retries:int = max_retries
+        self.retry_delay:float = retry_delay
+        self._host:str = server
+        self._port:int = port
+        self._auth_password:str = auth_password
+        self._server:smtplib.SMTP | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def server(self) -> smtplib.SMTP:
+        with self._lock:
+            if self._server is None:
+                server = smtplib.SMTP(self._host,self._port)
+                server.starttls()
+                server.login(self.sender,self._auth_password)
+                self._server = server
+            return self._server
 
     def __del__(self):
-        self.server.quit()
+        if getattr(self,"_server",None) is not None:
+            self.close()
 
-    def send(self,send_to: str | Sequence[str],subject:str,text:str) -> None:
+    def close(self) -> None:
         """
-        This method sends an email using the authenticated server saved within the object
+        Closes the connection to the smtp server, if one has been made
+        """
+        with self._lock:
+            if self._server is not None:
+                server, self._server = self._server, None
+                server.quit()
 
-        Parameters
-        ---------
-        send_to : str | Sequence[str]
-            The address or addresses to send the emails to
-        subject : str
-            The subject line of the email
-        text : str
-            The text of the email
+    def _deliver(self,send_to: str | Sequence[str],message:str,result:dict) -> None:
+        """
+        Sends a built message over the authenticated server saved within the object, retrying temporary errors
+
+        smtplib.SMTP can only send one message at a time, so sends from different threads wait for each other. Use an EmailServer per thread to send in parallel
+
+        Should not be run by the user.
         """
-        msg = MIMEMultipart()
-        msg["Subject"] = subject
-        msg["From"] = self.sender
-        msg["To"] = send_to
-        text = MIMEText(text,"html")
-        msg.attach(text)
-        self.server.sendmail(self.sender,send_to,msg.as_string())
+        while True:
+            try:
+                with self._lock:
+                    result["refused"] = self.server.sendmail(self.sender,send_to,message) or {}
+                # sendmail only returns once the server has accepted the message with a 250
+                result["code"] = 250
+                return
+            except smtplib.SMTPResponseException as e:
+                if 400 <= e.smtp_code < 500 and result["retries"] < self.max_retries:
+                    # Greylisting and rate limits need time to clear, so retrying straight away would just fail again
+                    time.sleep(self.retry_delay * 2 ** result["retries"])
+                    result["retries"] += 1
+                    continue
+                raise
@@ -0,0 +1,335 @@
+import logging
+import threading
+import time
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a fetch is refused because the circuit breaker for its host is open
+    """
+
+
+class HostError(ValueError):
+    """
+    Raised by fetch functions when a host answers with an error, such as a non-200 status code
+
+    HostError and OSError, which includes the connection and timeout errors raised by requests, count as failures of the host for its circuit breaker.
+    Other exceptions are problems with the content, such as a response that is too large or can't be decoded, and do not
+    """
+
+
+HOST_ERRORS = (HostError, OSError)
+
+
+class TokenBucket:
+    """
+    A token bucket used to rate limit requests to a single host
+
+    Attributes
+    -----
+    rate : float
+        The number of tokens added to the bucket per second
+    capacity : float
+        The maximum number of tokens the bucket can hold. This is the largest burst of requests allowed
+
+    Methods
+    -------
+    acquire()
+        Takes a token from the bucket, waiting until one is available
+    """
+    def __init__(self,
+                 rate:float,
+                 capacity:float,
+                 clock:Callable[[],float] = time.monotonic,
+                 sleep:Callable[[float],None] = time.sleep
+                 ) -> None:
+        """
+        Parameters
+        -----
+        rate : float
+            The number of tokens added to the bucket per second
+        capacity : float
+            The maximum number of tokens the bucket can hold
+        clock : Callable, optional
+            The function used to get the current time. Default time.monotonic
+        sleep : Callable, optional
+            The function used to wait for a token. Default time.sleep
+        """
+        self.rate:float = rate
+        self.capacity:float = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens:float = capacity
+        self._updated:float = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """
+        Takes a token from the bucket. If the bucket is empty, waits until a token has been added
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker for a single host
+
+    The breaker starts closed. After failure_threshold failures in a row it opens, and refuses calls until reset_timeout seconds have passed.
+    It then lets a single trial call through. A success closes the breaker again, a failure opens it for another reset_timeout seconds.
+
+    Attributes
+    -----
+    failure_threshold : int
+        The number of failures in a row needed to open the breaker
+    reset_timeout : float
+        The number of seconds the breaker stays open before allowing a trial call
+    state : str
+        One of "closed", "open" or "half-open"
+
+    Methods
+    -------
+    allow()
+        Returns whether a call should be attempted
+    record_success()
+        Records a successful call
+    record_failure()
+        Records a failed call
+    record_response()
+        Records a call that reached the host but failed for another reason
+    """
+    def __init__(self,
+                 failure_threshold:int = 3,
+                 reset_timeout:float = 60.0,
+                 clock:Callable[[],float] = time.monotonic
+                 ) -> None:
+        """
+        Parameters
+        -----
+        failure_threshold : int, optional
+            The number of failures in a row needed to open the breaker. Default 3
+        reset_timeout : float, optional
+            The number of seconds the breaker stays open. Default 60
+        clock : Callable, optional
+            The function used to get the current time. Default time.monotonic
+        """
+        self.failure_threshold:int = failure_threshold
+        self.reset_timeout:float = reset_timeout
+        self._clock = clock
+        self._failures:int = 0
+        self._opened_at:float | None = None
+        self._trial_running:bool = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Returns whether a call should be attempted. Only one trial call is allowed while half-open
+
+        Returns
+        -----
+        bool
+            True if the call should be attempted
+        """
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Records a successful call, closing the breaker
+        """
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_response(self) -> None:
+        """
+        Records a call that reached the host but failed for a reason that is not the host's fault
+
+        The breaker is left as it is, except that a half-open trial ends as a success, since the host answered
+        """
+        with self._lock:
+            if self._trial_running:
+                self._failures = 0
+                self._opened_at = None
+                self._trial_running = False
+
+    def record_failure(self) -> None:
+        """
+        Records a failed call, opening the breaker if the failure threshold has been reached
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class FetchPolicy:
+    """
+    Controls how sections fetch data from remote hosts
+
+    Every host gets its own rate limit and circuit breaker. When a fetch fails, or the host's breaker is open,
+    the last good result for the same key is served. If there is none, the placeholder given by the section is served.
+
+    Attributes
+    -----
+    rate : float | None
+        The number of requests per second allowed to each host. None means no limit
+    burst : int
+        The number of requests that can be made to a host at once before the rate limit applies
+    connect_timeout : float
+        The number of seconds to wait for a connection to a host
+    read_timeout : float
+        The number of seconds to wait for a host to send data
+    failure_threshold : int
+        The number of failures in a row before a host's circuit breaker opens
+    reset_timeout : float
+        The number of seconds a host's circuit breaker stays open
+
+    Methods
+    -------
+    fetch(url: str, fetch_function: Callable, placeholder: Any, key: str)
+        Runs the fetch_function for the url under this policy
+    """
+    def __init__(self,
+                 rate:float | None = None,
+                 burst:int = 1,
+                 connect_timeout:float = 5.0,
+                 read_timeout:float = 30.0,
+                 failure_threshold:int = 3,
+                 reset_timeout:float = 60.0,
+                 clock:Callable[[],float] = time.monotonic
+                 ) -> None:
+        """
+        Parameters
+        -----
+        rate : float, optional
+            The number of requests per second allowed to each host. Default None, no limit
+        burst : int, optional
+            The number of requests that can be made to a host at once. Default 1
+        connect_timeout : float, optional
+            The number of seconds to wait for a connection. Default 5
+        read_timeout : float, optional
+            The number of seconds to wait for a host to send data. Default 30
+        failure_threshold : int, optional
+            The number of failures in a row before a host's circuit breaker opens. Default 3
+        reset_timeout : float, optional
+            The number of seconds a host's circuit breaker stays open. Default 60
+        clock : Callable, optional
+            The function used to get the current time. Default time.monotonic
+        """
+        self.rate = rate
+        self.burst = burst
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._buckets:dict[str,TokenBucket] = {}
+        self._breakers:dict[str,CircuitBreaker] = {}
+        self._stale:dict[str,Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> tuple[float,float]:
+        """
+        The (connect, read) timeout tuple to pass to requests
+        """
+        return (self.connect_timeout, self.read_timeout)
+
+    def _host_state(self, host:str) -> tuple[TokenBucket | None, CircuitBreaker]:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout, self._clock)
+                if self.rate is not None:
+                    self._buckets[host] = TokenBucket(self.rate, self.burst, self._clock)
+            return self._buckets.get(host), self._breakers[host]
+
+    def fetch(self,
+              url:str,
+              fetch_function:Callable[[tuple[float,float]],Any],
+              placeholder:Any = None,
+              key:str | None = None
+              ) -> Any:
+        """
+        Runs the fetch_function under the rate limit and circuit breaker for the url's host
+
+        Parameters
+        -----
+        url : str
+            The url being fetched. Its host decides which rate limit and circuit breaker are used
+        fetch_function : Callable
+            A function that takes the (connect, read) timeout tuple and returns the fetched data. Should raise an exception on failure
+
+            Only HostError and OSError count towards opening the host's circuit breaker
+        placeholder : Any, optional
+            The value returned when the fetch fails and there is no earlier result to serve
+        key : str, optional
+            The key the result is cached under for stale serving. Default is the url
+
+        Returns
+        -----
+        Any
+            The result of the fetch_function, or the last good result or placeholder if it failed
+        """
+        if key is None:
+            key = url
+        bucket, breaker = self._host_state(urlparse(url).netloc)
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                result = fetch_function(self.timeout)
+            except HOST_ERRORS:
+                breaker.record_failure()
+                raise
+            except Exception:
+                breaker.record_response()
+                raise
+            breaker.record_success()
+        except Exception as e:
+            logger.warning("Fetch of %s failed, serving fallback: %s", url, e)
+            with self._lock:
+                return self._stale.get(key, placeholder)
+        with self._lock:
+            self._stale[key] = result
+        return result
+
+
+DEFAULT_FETCH_POLICY = FetchPolicy()
@@ -1,6 +1,14 @@
+import hashlib
 import inspect
+import json
 import os
 import jinja2
+import jinja2.meta
+
+# One environment per template folder, so each template is only loaded and compiled once. Jinja still reloads templates that change on disk
+_environments: dict[str, jinja2.Environment] = {}
+# The names of the templates each version of a template file includes, imports or extends, so its source is only parsed once per version
+_references: dict[str, tuple[str, ...]] = {}
 
 def get_template(base_obj: object) -> jinja2.Template:
     """
@@ -29,8 +37,93 @@ def get_template(base_obj: object) -> jinja2.Template:
         folder = os.path.join(os.path.dirname(inspect.getfile(base_obj.__class__)), "templates")
 
 
-    template_loader = jinja2.FileSystemLoader(searchpath= folder)
+    folder = os.path.abspath(folder)
+    template_env = _environments.get(folder)
+    if template_env is None:
+        template_loader = jinja2.FileSystemLoader(searchpath= folder)
+        template_env = _environments.setdefault(folder, jinja2.Environment(loader=template_loader))
+    return template_env.get_template(template)
 
 
-    template_env = jinja2.Environment(loader=template_loader)
-    return template_env.get_template(template)
+def fingerprint(data: object, template: jinja2.Template) -> str:
+    """
+    Creates a fingerprint of the data passed to a template and the identity of the template.
+
+    The same fingerprint means that rendering the template with the data will give the same output
+
+    Parameters
+    -----
+    data : object
+        The data to be rendered. Should be json serializable, anything that is not will be fingerprinted by its repr
+    template : jinja2.Template
+        The template the data will be rendered with
+    Returns
+    -----
+    str
+        A hex digest fingerprinting the data and template
+    """
+    try:
+        serialized = json.dumps(data, sort_keys=True, default=repr)
+    except TypeError:
+        serialized = repr(data)
+    digest = hashlib.sha256(serialized.encode())
+    digest.update(b"\0")
+    digest.update(template_identity(template).encode())
+    return digest.hexdigest()
+
+
+def template_identity(template: jinja2.Template) -> str:
+    """
+    Returns a str identifying a template file and its current version, along with every template it includes, imports or extends
+
+    Only templates referenced by a constant name are followed. A template chosen by a variable, such as {% include name %}, can't be known before rendering,
+    so changes to it do not change the identity
+
+    Parameters
+    -----
+    template : jinja2.Template
+        The template to identify
+    Returns
+    -----
+    str
+        The path of each template file along with its modification time and size
+    """
+    identities = []
+    seen = set()
+    pending = [template]
+    while pending:
+        current = pending.pop()
+        identity = _file_identity(current)
+        if identity in seen:
+            continue
+        seen.add(identity)
+        identities.append(identity)
+        for name in _referenced_templates(current, identity):
+            try:
+                pending.append(current.environment.get_template(name))
+            except jinja2.TemplateNotFound:
+                continue
+    return "|".join(identities)
+
+
+def _file_identity(template: jinja2.Template) -> str:
+    try:
+        stat = os.stat(template.filename)
+    except (OSError, TypeError):
+        return f"{template.name}"
+    return f"{os.path.abspath(template.filename)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _referenced_templates(template: jinja2.Template, identity: str) -> tuple[str, ...]:
+    references = _references.get(identity)
+    if references is not None:
+        return references
+    environment = template.environment
+    if environment.loader is None or template.name is None:
+        return ()
+    try:
+        source = environment.loader.get_source(environment, template.name)[0]
+    except jinja2.TemplateNotFound:
+        return ()
+    references = tuple(name for name in jinja2.meta.find_referenced_templates(environment.parse(source)) if name is not None)
+    return _references.setdefault(identity, references)
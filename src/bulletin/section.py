@@ -1,9 +1,15 @@
-import dateutil
+import datetime
+import threading
 import requests
 from typing import Callable
+from urllib.parse import urlparse
 import feedparser
 from .helpers import get_template
+from .fetch import FetchPolicy, HostError, DEFAULT_FETCH_POLICY
+from .dates import DateParser, DEFAULT_DATE_PARSER
+from .streaming import LimitedReader, ResponseTooLarge, load_json, CHUNK_SIZE
 import markdown
+from markupsafe import Markup
 
 
 DEFAULT_TEMPLATE_FOLDER = "templates"
@@ -26,6 +32,8 @@ class Section:
         Should be a function that takes a dictionary as input, then returns in a format that is processable by the render method and template
     config : dict
         Any data needed for the process_function, or other objects should be stored here. Any information needed that is not directly for the Section class' functions should be stored here
+
+        The process_function should only read the config, since a section can be rendered from several threads at once
     template_folder : str
         The path relative to the current working directory where a non-default template is stored.
 
@@ -34,6 +42,8 @@ class Section:
         The name of a template file within the template_folder directory. Will be used in place of the default template
 
         This attribute will only exist if a template is given on initialization of the object
+    static : bool
+        Whether the section always renders the same html. A static section is only processed and rendered the first time it is rendered
 
     Methods
     -------
@@ -53,6 +63,7 @@ class Section:
                  config:dict={},
                  template:str = None,
                  template_folder:str=DEFAULT_TEMPLATE_FOLDER,
+                 static:bool = False,
                  ) -> None:
         """
         Parameters
@@ -67,11 +78,18 @@ class Section:
             The name of a template file within the template_folder directory. Will be used in place of the class' default template
         template_folder : str, optional
             The path relative to the current working directory where a non-default template is stored.
+        static : bool, optional
+            Whether the section always renders the same html. Default False
+
+            If True, the section is rendered once and the html is reused for every later render, so changes to the config after the first render are ignored
 
         """
         self.process_function = process_function
         self.config = config
         self.template_folder = template_folder
+        self.static = static
+        self._fragment: Markup | None = None
+        self._lock = threading.Lock()
         if template is not None:
             self.template = template
 
@@ -99,15 +117,98 @@ class Section:
         Returns
         -----
         str
-            the str of html from the rendered Jinja template
+            the str of html from the rendered Jinja template. For static sections this is Markup, rendered on the first call
+        """
+        if self.static:
+            if self._fragment is None:
+                with self._lock:
+                    if self._fragment is None:
+                        self._fragment = Markup(self._render(self._process()))
+            return self._fragment
+        return self._render(self._process())
+
+    def _render(self, data:any) -> str:
         """
-        data = self._process()
+        Gets the Jinja template for the object and renders it using the data given
 
+        Should not be run by the user.
+
+        Parameters
+        -----
+        data : Any
+            The output of the process function
+        Returns
+        -----
+        str
+            the str of html from the rendered Jinja template
+        """
         template = get_template(self)
         return template.render(data=data)
     
     
 
+class FeedItem:
+    """
+    A single item of an RSS feed
+
+    Uses __slots__ to keep large feeds small in memory. Items can be accessed as attributes or by key, so templates can use item.href or item['href']
+
+    Attributes
+    -----
+    href : str
+        The link to the item
+    title : str
+        The title of the item
+    published : str | None
+        The publish date of the item, as given in the feed
+    pub_date : datetime.datetime | None
+        The publish date of the item. Only parsed the first time it is accessed
+    """
+    __slots__ = ("href", "title", "published", "_pub_date", "_date_parser")
+    _keys = ("href", "title", "pub_date")
+
+    def __init__(self, href:str, title:str, published:str | None = None, date_parser:DateParser = DEFAULT_DATE_PARSER) -> None:
+        """
+        Parameters
+        -----
+        href : str
+            The link to the item
+        title : str
+            The title of the item
+        published : str, optional
+            The publish date of the item, as given in the feed
+        date_parser : DateParser, optional
+            The parser used for pub_date. Items from the same feed should share a parser so it can remember the feed's date format
+        """
+        self.href = href
+        self.title = title
+        self.published = published
+        self._pub_date = None
+        self._date_parser = date_parser
+
+    @property
+    def pub_date(self) -> datetime.datetime | None:
+        if self._pub_date is None and self.published is not None:
+            self._pub_date = self._date_parser.parse(self.published)
+        return self._pub_date
+
+    def __getitem__(self, key:str) -> any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __eq__(self, other:object) -> bool:
+        if not isinstance(other, FeedItem):
+            return NotImplemented
+        return (self.href, self.title, self.published) == (other.href, other.title, other.published)
+
+    def __hash__(self) -> int:
+        return hash((self.href, self.title, self.published))
+
+    def __repr__(self) -> str:
+        return f"FeedItem(href={self.href!r}, title={self.title!r}, published={self.published!r})"
+
+
 class IndividualRSSFeed(Section):
     """
     A section class that returns the contents of an RSS feed at the given url
@@ -150,6 +251,8 @@ class IndividualRSSFeed(Section):
         NOT IMPLEMENTED
     url : str
         The url of the rss feed
+    fetch_policy : FetchPolicy
+        The policy used to fetch the feed. Only present if one was given on initialization, otherwise DEFAULT_FETCH_POLICY is used
     
     Default Template
     -----
@@ -164,7 +267,8 @@ class IndividualRSSFeed(Section):
                      "since_last":False
                      }, 
                  template:str = None,
-                 template_folder:str = DEFAULT_TEMPLATE_FOLDER) -> None:
+                 template_folder:str = DEFAULT_TEMPLATE_FOLDER,
+                 fetch_policy:FetchPolicy = None) -> None:
         """
         Parameters
         -------
@@ -178,10 +282,14 @@ class IndividualRSSFeed(Section):
             The name of a template file within the template_folder directory. Will be used in place of the class' default template
         template_folder : str, optional
             The path relative to the current working directory where a non-default template is stored.
+        fetch_policy : FetchPolicy, optional
+            The policy used for rate limits, timeouts and failures when fetching the feed. Default DEFAULT_FETCH_POLICY
 
         """
-        conf = config
+        conf = dict(config)
         conf["url"] = url
+        if fetch_policy is not None:
+            conf["fetch_policy"] = fetch_policy
         super().__init__(self._process_rss_feed, 
                          conf, 
                          template=template,
@@ -203,19 +311,50 @@ class IndividualRSSFeed(Section):
         -----
         dict
             A dict containing the title of the feed. Along with items that have title, pub_date, and href link
+
+            If the feed can't be fetched, the last good result is returned. If there is none, the feed has no title or items
+        """
+        url = config["url"]
+        if urlparse(url).scheme not in ("http", "https"):
+            # Local files and other urls feedparser understands are not fetched from a host, so are parsed directly
+            return IndividualRSSFeed._parse_rss_feed(url, config)
+        policy: FetchPolicy = config.get("fetch_policy", DEFAULT_FETCH_POLICY)
+
+        def fetch(timeout):
+            req = requests.get(url, timeout=timeout)
+            if req.status_code != 200:
+                raise HostError(f"Request to {url} Failed")
+            # The content-location header gives feedparser the url to resolve relative links against
+            response_headers = {**req.headers, "content-location": req.url}
+            return IndividualRSSFeed._parse_rss_feed(req.content, config, response_headers)
+
+        return policy.fetch(url, fetch, placeholder={"title":"","items":[]}, key=f"{url}#{config['items']}")
+
+    @staticmethod
+    def _parse_rss_feed(content:bytes | str, config:dict, response_headers:dict = None) -> dict:
         """
+        Parses the fetched feed into the data passed to the template
 
-        parsed_feed: feedparser.FeedParserDict = feedparser.parse(config["url"])
+        Parameters
+        -----
+        content : bytes | str
+            The body of the feed, or a url or path feedparser can read it from
+        config : dict
+            The config of the section
+        response_headers : dict, optional
+            The headers of the response the feed was fetched in. Used for the feed's base url and charset
+
+        Returns
+        -----
+        dict
+            A dict containing the title of the feed. Along with a list of FeedItem
+        """
+        parsed_feed: feedparser.FeedParserDict = feedparser.parse(content, response_headers=response_headers)
         data = {}
         data["title"] = parsed_feed.feed.title
-        data["items"] = []
-        items = min(config["items"], len(parsed_feed.entries))
-        for item in range(items):
-            i = {}
-            i["href"] = parsed_feed.entries[item].link
-            i["pub_date"] = dateutil.parser.parse(parsed_feed.entries[item].published)
-            i["title"] = parsed_feed.entries[item].title
-            data["items"].append(i)
+        date_parser = DateParser()
+        data["items"] = [FeedItem(entry.link, entry.title, entry.get("published"), date_parser)
+                         for entry in parsed_feed.entries[:config["items"]]]
         return data
 
 
@@ -232,7 +371,7 @@ class RequestsGetSection(Section):
 
         For this class the default is 'section.html'
     config : dict
-        Any config needed for the section
+        Any config needed for the section. A fetch_policy key holds the FetchPolicy given on initialization, otherwise DEFAULT_FETCH_POLICY is used
     template_folder : str
         The path relative to the current working directory where a non-default template is stored.
 
@@ -260,7 +399,10 @@ class RequestsGetSection(Section):
                  params:dict = {},
                  config={}, 
                  template = None, 
-                 template_folder = DEFAULT_TEMPLATE_FOLDER) -> None:
+                 template_folder = DEFAULT_TEMPLATE_FOLDER,
+                 fetch_policy:FetchPolicy = None,
+                 max_bytes:int = None,
+                 json_path:str = None) -> None:
         """
         Parameters
         -------
@@ -284,12 +426,29 @@ class RequestsGetSection(Section):
             The name of a template file within the template_folder directory. Will be used in place of the class' default template
         template_folder : str, optional
             The path relative to the current working directory where a non-default template is stored.
+        fetch_policy : FetchPolicy, optional
+            The policy used for rate limits, timeouts and failures when making the request. Default DEFAULT_FETCH_POLICY
+        max_bytes : int, optional
+            The largest response body allowed. Larger responses are treated as a failed request. Default None, no limit
+        json_path : str, optional
+            Only return part of a json response. A dot separated list of keys, where the key item matches every element of an array
+
+            For example "results.item.title" returns a list of the title of every result. Default None, the whole response
+
+            If ijson is installed, the response is decoded as it is read and only the selected part is kept in memory
 
         """
+        config = dict(config)
         config["url"] = url
         config["headers"] = headers
         config["return_type"] = return_type
         config["params"] = params
+        if fetch_policy is not None:
+            config["fetch_policy"] = fetch_policy
+        if max_bytes is not None:
+            config["max_bytes"] = max_bytes
+        if json_path is not None:
+            config["json_path"] = json_path
         super().__init__(self._process_request_get, config, template, template_folder)
 
     @staticmethod
@@ -308,17 +467,34 @@ class RequestsGetSection(Section):
             Returns the value of the get request jsonified. determined by the config's "return_type" value
         str
             Returns the value of the get request as plain text. determined by the config's "return_type" value
+
+            If the request fails, the last good result is returned. If there is none, an empty dict or str is returned depending on the return_type
         """
         url = config["url"]
-        req = requests.get(url, headers=config["headers"],params=config["params"])
-        try:
-            assert req.status_code == 200
-        except AssertionError as e:
-            raise ValueError(f"Request to {url} Failed")
-        if config["return_type"] == "json":
-            return req.json()
-        elif config["return_type"] == "text":
-            return req.content.decode()
+        policy: FetchPolicy = config.get("fetch_policy", DEFAULT_FETCH_POLICY)
+
+        def fetch(timeout):
+            req = requests.get(url, headers=config["headers"],params=config["params"],timeout=timeout,stream=True)
+            try:
+                try:
+                    assert req.status_code == 200
+                except AssertionError as e:
+                    raise HostError(f"Request to {url} Failed")
+                max_bytes = config.get("max_bytes")
+                length = req.headers.get("Content-Length")
+                if max_bytes is not None and length is not None and int(length) > max_bytes:
+                    raise ResponseTooLarge(f"Response from {url} is larger than {max_bytes} bytes")
+                reader = LimitedReader(req.iter_content(CHUNK_SIZE), max_bytes)
+                if config["return_type"] == "json":
+                    return load_json(reader, config.get("json_path"))
+                elif config["return_type"] == "text":
+                    return reader.read().decode()
+            finally:
+                req.close()
+
+        placeholder = {} if config["return_type"] == "json" else ""
+        key = f"{url}?{sorted(config['params'].items())}#{config.get('json_path')}:{config['return_type']}:{sorted(config['headers'].items())}"
+        return policy.fetch(url, fetch, placeholder=placeholder, key=key)
 
     
 class PlainTextSection(Section):
@@ -360,7 +536,8 @@ class PlainTextSection(Section):
                  encoding:str="html", 
                  config={}, 
                  template = None, 
-                 template_folder = DEFAULT_TEMPLATE_FOLDER) -> None:
+                 template_folder = DEFAULT_TEMPLATE_FOLDER,
+                 static:bool = True) -> None:
         """
         Parameters
         -------
@@ -378,15 +555,19 @@ class PlainTextSection(Section):
             The name of a template file within the template_folder directory. Will be used in place of the class' default template
         template_folder : str, optional
             The path relative to the current working directory where a non-default template is stored.
+        static : bool, optional
+            Whether the section is rendered once and reused. Default True, since the text does not change
 
         """
+        config = dict(config)
         config["text"] = text
         config["encoding"] = encoding
         super().__init__(
                         process_function=self._process_plain_text, 
                         config=config, 
                         template=template, 
-                        template_folder=template_folder)
+                        template_folder=template_folder,
+                        static=static)
     
     @staticmethod
     def _process_plain_text(config) -> str:
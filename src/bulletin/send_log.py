@@ -0,0 +1,178 @@
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Iterable
+
+
+class SendLog:
+    """
+    An append only log of sent emails, stored as JSON lines
+
+    Each line records one message: when it was sent, which run and bulletin it belongs to, how many recipients and bytes it had,
+    how long the smtp server took, the smtp response code, how many retries were needed and the error if it failed
+
+    Attributes
+    -----
+    path : str
+        The path of the log file
+    run_id : str
+        Identifies this run in the log. Every record written by this object has this run_id
+
+    Methods
+    -------
+    record(**fields)
+        Appends a record to the log
+    read(path: str)
+        Reads all the records in a log file
+    """
+    def __init__(self, path:str, run_id:str = None) -> None:
+        """
+        Parameters
+        -----
+        path : str
+            The path of the log file. Created if it does not exist
+        run_id : str, optional
+            Identifies this run in the log. Default is a random id
+        """
+        self.path = path
+        self.run_id = run_id if run_id is not None else uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record(self, **fields) -> dict:
+        """
+        Appends a record to the log. The timestamp and run_id are added if not given
+
+        Returns
+        -----
+        dict
+            The record written
+        """
+        entry = {"timestamp": time.time(), "run_id": self.run_id}
+        entry.update(fields)
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return entry
+
+    @staticmethod
+    def read(path:str) -> list[dict]:
+        """
+        Reads all the records in a log file
+
+        Parameters
+        -----
+        path : str
+            The path of the log file
+        Returns
+        -----
+        list[dict]
+            The records in the order they were written
+        """
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values:list[float], percent:float) -> float | None:
+    """
+    Returns the nearest rank percentile of the values
+
+    Parameters
+    -----
+    values : list[float]
+        The values, in any order
+    percent : float
+        The percentile to return, between 0 and 100
+    Returns
+    -----
+    float | None
+        The percentile, or None if there are no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records:Iterable[dict]) -> dict:
+    """
+    Summarizes send log records
+
+    Parameters
+    -----
+    records : Iterable[dict]
+        The records from a SendLog
+    Returns
+    -----
+    dict
+        The number of messages, failures, retries, bytes, the messages per second, the p50, p95 and p99 latency in seconds and a count of each error
+    """
+    records = list(records)
+    latencies = [r["latency"] for r in records]
+    failures = [r for r in records if r.get("error") is not None]
+    summary = {
+        "messages": len(records),
+        "failures": len(failures),
+        "retries": sum(r.get("retries", 0) for r in records),
+        "bytes": sum(r.get("bytes", 0) for r in records),
+        "per_second": None,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "errors": dict(Counter(f"{r['error']} ({r.get('code')})" for r in failures)),
+    }
+    if records:
+        duration = max(r["timestamp"] + r["latency"] for r in records) - min(r["timestamp"] for r in records)
+        if duration > 0:
+            summary["per_second"] = len(records) / duration
+    return summary
+
+
+def report(records:Iterable[dict]) -> str:
+    """
+    Creates a plain text report of send log records, summarized per run and per bulletin within each run
+
+    Parameters
+    -----
+    records : Iterable[dict]
+        The records from a SendLog
+    Returns
+    -----
+    str
+        The report
+    """
+    runs:dict[str,list[dict]] = {}
+    for r in records:
+        runs.setdefault(r["run_id"], []).append(r)
+
+    lines = []
+    for run_id, run_records in runs.items():
+        lines.append(_format_summary(f"run {run_id}", summarize(run_records)))
+        bulletins:dict[str,list[dict]] = {}
+        for r in run_records:
+            bulletins.setdefault(str(r.get("bulletin")), []).append(r)
+        for name, bulletin_records in bulletins.items():
+            lines.append(_format_summary(f"  bulletin {name}", summarize(bulletin_records)))
+    return "\n".join(lines)
+
+
+def _format_summary(label:str, summary:dict) -> str:
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}ms"
+
+    per_second = "-" if summary["per_second"] is None else f"{summary['per_second']:.2f}/s"
+    line = (f"{label}: {summary['messages']} messages, {summary['failures']} failed, {summary['retries']} retries, "
+            f"{summary['bytes']} bytes, {per_second}, "
+            f"p50 {ms(summary['p50'])} p95 {ms(summary['p95'])} p99 {ms(summary['p99'])}")
+    indent = " " * (len(label) - len(label.lstrip()) + 4)
+    for error, count in summary["errors"].items():
+        line += f"\n{indent}{error}: {count}"
+    return line
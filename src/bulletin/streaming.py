@@ -0,0 +1,147 @@
+import json
+from typing import Any, Iterable, Iterator
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(ValueError):
+    """
+    Raised when a response body is larger than the maximum size allowed
+    """
+
+
+class LimitedReader:
+    """
+    A file-like object reading a response body from an iterator of chunks, raising ResponseTooLarge once more than max_bytes have been read
+
+    Attributes
+    -----
+    max_bytes : int | None
+        The maximum number of bytes that can be read. None means no limit
+    bytes_read : int
+        The number of bytes read from the chunks so far
+
+    Methods
+    -------
+    read(size: int)
+        Reads up to size bytes. Reads everything that is left if size is negative
+    """
+    def __init__(self, chunks:Iterable[bytes], max_bytes:int | None = None) -> None:
+        """
+        Parameters
+        -----
+        chunks : Iterable[bytes]
+            The chunks of the body, such as from requests.Response.iter_content
+        max_bytes : int, optional
+            The maximum number of bytes that can be read. Default None, no limit
+        """
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self._chunks:Iterator[bytes] = iter(chunks)
+        self._buffer = b""
+
+    def _next_chunk(self) -> bytes:
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+                raise ResponseTooLarge(f"Response is larger than {self.max_bytes} bytes")
+            return chunk
+        return b""
+
+    def read(self, size:int = -1) -> bytes:
+        """
+        Reads up to size bytes
+
+        Parameters
+        -----
+        size : int, optional
+            The number of bytes to read. Reads everything that is left if negative. Default -1
+        Returns
+        -----
+        bytes
+            The bytes read. Empty once the body has been read
+        """
+        if size is None or size < 0:
+            parts = [self._buffer]
+            while chunk := self._next_chunk():
+                parts.append(chunk)
+            self._buffer = b""
+            return b"".join(parts)
+        while len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def select_json(data:Any, path:str) -> Any:
+    """
+    Selects part of decoded json using a path
+
+    The path is a dot separated list of keys. The key item matches every element of an array
+
+    Parameters
+    -----
+    data : Any
+        The decoded json
+    path : str
+        The path to select. An empty path selects all of data
+    Returns
+    -----
+    Any
+        The value at the path. If the path contains item, a list of every value matched
+    """
+    parts = path.split(".") if path else []
+    matches = [data]
+    for part in parts:
+        selected = []
+        for value in matches:
+            if part == "item" and isinstance(value, list):
+                selected.extend(value)
+            elif isinstance(value, dict) and part in value:
+                selected.append(value[part])
+        matches = selected
+    if "item" in parts:
+        return matches
+    if not matches:
+        raise ValueError(f"Nothing found at {path!r}")
+    return matches[0]
+
+
+def load_json(reader:LimitedReader, path:str | None = None) -> Any:
+    """
+    Decodes json from a reader, keeping only the part selected by path
+
+    If ijson is installed, the json is decoded incrementally, so only the selected part is kept in memory,
+    and reading stops as soon as it has been found. Otherwise the whole body is decoded, then the part is selected
+
+    Parameters
+    -----
+    reader : LimitedReader
+        The reader of the response body
+    path : str, optional
+        The path to select, see select_json. Default None, the whole document
+    Returns
+    -----
+    Any
+        The selected json
+    """
+    if path is None:
+        return json.loads(reader.read())
+    if ijson is None:
+        return select_json(json.loads(reader.read()), path)
+    matches = ijson.items(reader, path, use_float=True)
+    if "item" in path.split("."):
+        return list(matches)
+    for match in matches:
+        return match
+    raise ValueError(f"Nothing found at {path!r}")
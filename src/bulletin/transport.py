@@ -0,0 +1,208 @@
+import abc
+import os
+import socket
+import threading
+import time
+import uuid
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Sequence
+from .send_log import SendLog
+
+DEFAULT_SENDER = "bulletin@localhost"
+
+
+class Transport(abc.ABC):
+    """
+    The parent class of all transports. A transport delivers the emails a bulletin sends
+
+    Subclasses implement _deliver. Building the message and recording it in the send log is handled here
+
+    Attributes
+    -----
+    sender : str
+        The address used as the sender of emails
+    send_log : SendLog | None
+        The log every sent message is recorded in
+
+    Methods
+    -------
+    send(send_to: str | Sequence[str], subject: str, text: str, bulletin: str)
+        Sends an email to the addresses given, with the given subject and text lines
+    close()
+        Finishes any pending deliveries and releases the transport's resources. Also called when a transport used as a context manager exits
+    """
+    def __init__(self, sender:str = DEFAULT_SENDER, send_log:SendLog = None) -> None:
+        """
+        Parameters
+        -----
+        sender : str, optional
+            The address used as the sender of emails. Default bulletin@localhost
+        send_log : SendLog, optional
+            A log to record the timing, size and result of every message sent
+        """
+        self.sender:str = sender
+        self.send_log:SendLog | None = send_log
+
+    def _build_message(self, send_to:str | Sequence[str], subject:str, text:str) -> str:
+        msg = MIMEMultipart()
+        msg["Subject"] = subject
+        msg["From"] = self.sender
+        msg["To"] = send_to if isinstance(send_to,str) else ", ".join(send_to)
+        text = MIMEText(text,"html")
+        msg.attach(text)
+        return msg.as_string()
+
+    @abc.abstractmethod
+    def _deliver(self, send_to:str | Sequence[str], message:str, result:dict) -> None:
+        """
+        Delivers a built message. Should not be run by the user.
+
+        Parameters
+        -----
+        send_to : str | Sequence[str]
+            The address or addresses to send the message to
+        message : str
+            The message, as a str
+        result : dict
+            Filled in with the response code, retries and refused recipients of the delivery. The code starts as None and should only be set to a code the server actually returned
+        """
+
+    def send(self, send_to:str | Sequence[str], subject:str, text:str, bulletin:str | None = None) -> None:
+        """
+        Sends an email
+
+        Parameters
+        ---------
+        send_to : str | Sequence[str]
+            The address or addresses to send the emails to
+        subject : str
+            The subject line of the email
+        text : str
+            The text of the email
+        bulletin : str, optional
+            The name of the bulletin being sent, recorded in the send log
+        """
+        message = self._build_message(send_to, subject, text)
+        result = {"code": None, "retries": 0, "refused": {}}
+        error = None
+        start_time = time.time()
+        start = time.perf_counter()
+        try:
+            self._deliver(send_to, message, result)
+        except Exception as e:
+            result["code"] = getattr(e,"smtp_code",None)
+            error = e.__class__.__name__
+            raise
+        finally:
+            if self.send_log is not None:
+                self.send_log.record(
+                    timestamp=start_time,
+                    bulletin=bulletin if bulletin is not None else subject,
+                    recipients=1 if isinstance(send_to,str) else len(send_to),
+                    refused=len(result["refused"]),
+                    bytes=len(message.encode()),
+                    latency=time.perf_counter() - start,
+                    code=result["code"],
+                    retries=result["retries"],
+                    error=error,
+                )
+
+    def close(self) -> None:
+        """
+        Finishes any pending deliveries and releases the transport's resources
+        """
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class MemoryTransport(Transport):
+    """
+    A transport that keeps sent emails in memory instead of delivering them. Useful for tests and for measuring rendering speed
+
+    Attributes
+    -----
+    messages : list[dict]
+        The emails sent, each with a to key holding the recipients and a message key holding the full email as a str
+    """
+    def __init__(self, sender:str = DEFAULT_SENDER, send_log:SendLog = None) -> None:
+        """
+        Parameters
+        -----
+        sender : str, optional
+            The address used as the sender of emails. Default bulletin@localhost
+        send_log : SendLog, optional
+            A log to record the timing, size and result of every message sent
+        """
+        super().__init__(sender, send_log)
+        self.messages:list[dict] = []
+        self._lock = threading.Lock()
+
+    def _deliver(self, send_to:str | Sequence[str], message:str, result:dict) -> None:
+        with self._lock:
+            self.messages.append({"to": send_to, "message": message})
+
+
+class FileTransport(Transport):
+    """
+    A transport that writes emails to a local directory instead of delivering them
+
+    Each email is written to its own file before send returns, so an email logged or recorded as sent is always on disk
+
+    Attributes
+    -----
+    directory : str
+        The directory emails are written to
+    format : str
+        Either "eml", which writes each email to a .eml file in directory, or "maildir", which treats directory as a maildir and writes emails to its new folder
+    """
+    FORMATS = ("eml", "maildir")
+
+    def __init__(self,
+                 directory:str,
+                 format:str = "eml",
+                 sender:str = DEFAULT_SENDER,
+                 send_log:SendLog = None) -> None:
+        """
+        Parameters
+        -----
+        directory : str
+            The directory to write emails to. Created if it does not exist
+        format : str, optional
+            Either "eml" or "maildir". Default eml
+        sender : str, optional
+            The address used as the sender of emails. Default bulletin@localhost
+        send_log : SendLog, optional
+            A log to record the timing, size and result of every message sent
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"format must be one of {self.FORMATS}")
+        super().__init__(sender, send_log)
+        self.directory = directory
+        self.format = format
+        self._hostname = socket.gethostname().replace("/", "_").replace(":", "_")
+        if format == "maildir":
+            for folder in ("tmp", "new", "cur"):
+                os.makedirs(os.path.join(directory, folder), exist_ok=True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _next_name(self) -> str:
+        return f"{time.time_ns()}.P{os.getpid()}R{uuid.uuid4().hex[:12]}.{self._hostname}"
+
+    def _deliver(self, send_to:str | Sequence[str], message:str, result:dict) -> None:
+        name = self._next_name()
+        if self.format == "maildir":
+            # Written to tmp then moved, so a maildir reader never sees a partly written email
+            tmp_path = os.path.join(self.directory, "tmp", name)
+            final_path = os.path.join(self.directory, "new", name)
+        else:
+            tmp_path = os.path.join(self.directory, f".{name}.tmp")
+            final_path = os.path.join(self.directory, f"{name}.eml")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(message)
+        os.replace(tmp_path, final_path)
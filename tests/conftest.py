@@ -1,7 +1,6 @@
 import pytest
 import smtplib
 import os
-import feedparser
 import json
 import requests
 
@@ -44,38 +43,45 @@ def change_directory(monkeypatch):
 @pytest.fixture
 def mock_feedparser_parse(monkeypatch:pytest.MonkeyPatch):
 
-    def mock_feed_get(link:str, *args):
-
-        name:str = link.split("//")[1].split(".")[0]
-        with open(os.path.join("data",f"{name}.txt")) as f:
-            return bytes(f.read(), encoding="utf-8")
-        
+    def mock_feed_get(url,*args,**kwargs):
+        return mock_request(url)
 
-
-    monkeypatch.setattr(feedparser.http,"get",mock_feed_get)
+    monkeypatch.setattr(requests,"get",mock_feed_get)
 
 def mock_process_function(config):
     return {"test":"test"}
 
 
 class mock_request:
-    def __init__(self,url,headers,params):
+    def __init__(self,url,headers=None,params=None,timeout=None,stream=False):
         self.name = url.split("//")[1].split(".")[0]
+        self.url = url
+        self.headers = {}
 
     def json(self) -> dict:
         with open(os.path.join("data",f"{self.name}.json")) as f:
             return json.load(f)
     
-    def content(self) -> str:
+    @property
+    def content(self) -> bytes:
         with open(os.path.join("data",f"{self.name}.txt")) as f:
-            return f.read()
+            return bytes(f.read(), encoding="utf-8")
+    def iter_content(self,chunk_size=1):
+        extension = "json" if os.path.exists(os.path.join("data",f"{self.name}.json")) else "txt"
+        with open(os.path.join("data",f"{self.name}.{extension}"),"rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def close(self):
+        pass
+
     @property
     def status_code(self):
         return 200
         
 @pytest.fixture
 def mock_request_get(monkeypatch):
-    def mock_get(url,headers,params):
-        return mock_request(url,headers,params)
+    def mock_get(url,headers,params,timeout=None,stream=False):
+        return mock_request(url,headers,params,timeout,stream)
     
     monkeypatch.setattr(requests,"get",mock_get)
\ No newline at end of file
@@ -1,9 +1,13 @@
 from bulletin.bulletin import Bulletin
 from bulletin.email_server import EmailServer
-from bulletin.section import Section
+from bulletin.section import Section,PlainTextSection
+from bulletin.transport import MemoryTransport
+from bulletin.cache import RenderCache
 import pytest
 from conftest import mock_process_function
 import os
+import jinja2
+import threading
 
 @pytest.mark.parametrize(("config","template","template_folder","expected"),
                          [
@@ -48,4 +52,164 @@ def test_bulletin_render(config,template,template_folder,expected,monkeypatch,mo
 
     with open(os.path.join("expected",expected)) as f:
         expected_text = f.read()
-    assert rendered == expected_text
\ No newline at end of file
+    assert rendered == expected_text
+
+def test_bulletin_render_cache(mock_get_smtp_server,monkeypatch):
+    server = EmailServer("test","test","test.example.com")
+    bullet = Bulletin(server,cache=RenderCache())
+    bullet.add_section(Section(mock_process_function))
+    first = bullet.render()
+
+    def fail_render(*args,**kwargs):
+        raise AssertionError("Rendered a cached section")
+
+    monkeypatch.setattr(jinja2.Template,"render",fail_render)
+    assert bullet.render() == first
+    with open(os.path.join("expected","bulletin_render_default.txt")) as f:
+        assert first == f.read()
+
+
+def test_bulletin_send_skip_unchanged(mock_get_smtp_server,tmp_path):
+    server = EmailServer("test","test","test.example.com")
+    config = {"value":"first"}
+    bullet = Bulletin(server,cache=RenderCache(str(tmp_path)))
+    bullet.add_section(Section(lambda c: c["value"],config))
+    assert bullet.send("test@example.com",skip_unchanged=True)
+    assert not bullet.send("test@example.com",skip_unchanged=True)
+    assert bullet.send("other@example.com",skip_unchanged=True)
+
+    reloaded = Bulletin(server,cache=RenderCache(str(tmp_path)))
+    reloaded.add_section(Section(lambda c: c["value"],config))
+    assert not reloaded.send("test@example.com",skip_unchanged=True)
+    config["value"] = "second"
+    assert reloaded.send("test@example.com",skip_unchanged=True)
+    assert "second" in server.server.msg
+
+
+def test_bulletin_send_skip_unchanged_requires_cache(mock_get_smtp_server):
+    bullet = Bulletin(EmailServer("test","test","test.example.com"))
+    with pytest.raises(ValueError):
+        bullet.send("test@example.com",skip_unchanged=True)
+
+
+def test_bulletin_render_static_section(mock_get_smtp_server):
+    calls = []
+
+    def process(config):
+        calls.append(config)
+        return "static"
+
+    bullet = Bulletin(EmailServer("test","test","test.example.com"),cache=RenderCache())
+    bullet.add_section(Section(process,static=True))
+    bullet.add_section(Section(mock_process_function))
+    first = bullet.render()
+    assert bullet.render() == first
+    assert "static" in first
+    assert len(calls) == 1
+
+
+def test_bulletin_snapshot(mock_get_smtp_server):
+    bullet = Bulletin(EmailServer("test","test","test.example.com"),config={"subject":"Test"})
+    bullet.add_section(Section(mock_process_function))
+    snapshot = bullet.snapshot()
+    bullet.add_section(Section(mock_process_function))
+    assert len(snapshot.sections) == 1
+    assert isinstance(snapshot.sections,tuple)
+    assert snapshot.render() != bullet.render()
+    with pytest.raises(TypeError):
+        snapshot.add_section(Section(mock_process_function))
+    with pytest.raises(TypeError):
+        snapshot.template = "base.html"
+    with pytest.raises(TypeError):
+        snapshot.config["subject"] = "Changed"
+
+
+def test_bulletin_threaded_stress():
+    transport = MemoryTransport()
+    bullet = Bulletin(transport,config={"subject":"Test"},cache=RenderCache(),fetch_workers=2)
+    bullet.add_section(PlainTextSection("**static**",encoding="markdown"))
+    for i in range(4):
+        bullet.add_section(Section(lambda config: {"index":config["index"]},{"index":i}))
+    snapshot = bullet.snapshot()
+    expected = Bulletin(MemoryTransport(),config={"subject":"Test"})
+    for section in snapshot.sections:
+        expected.add_section(section)
+    expected_text = expected.render()
+
+    threads = 8
+    iterations = 50
+    barrier = threading.Barrier(threads + 1)
+    errors = []
+
+    def worker():
+        barrier.wait()
+        try:
+            for _ in range(iterations):
+                assert snapshot.render() == expected_text
+                snapshot.send("test@example.com")
+        except Exception as e:
+            errors.append(e)
+
+    def writer():
+        barrier.wait()
+        for i in range(iterations):
+            bullet.add_section(Section(lambda config: {"extra":config["index"]},{"index":i}))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)] + [threading.Thread(target=writer)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert errors == []
+    assert len(transport.messages) == threads * iterations
+    assert len(bullet.sections) == 5 + iterations
+    assert len(snapshot.sections) == 5
+
+
+def test_bulletin_send_skip_unchanged_shared_cache():
+    cache = RenderCache()
+    transport = MemoryTransport()
+    bulletins = []
+    for name in ["daily","weekly"]:
+        bullet = Bulletin(transport,config={"subject":"Bulletin","name":name},cache=cache)
+        bullet.add_section(Section(lambda c: c["value"],{"value":name}))
+        bulletins.append(bullet)
+    for _ in range(2):
+        for bullet in bulletins:
+            bullet.send("test@example.com",skip_unchanged=True)
+    assert len(transport.messages) == 2
+
+
+class CustomRenderSection(Section):
+    def render(self) -> str:
+        return "CUSTOM"
+
+
+@pytest.mark.parametrize("cache",[None,RenderCache()])
+def test_bulletin_render_section_override(cache):
+    bullet = Bulletin(MemoryTransport(),cache=cache,fetch_workers=2)
+    bullet.add_section(CustomRenderSection(mock_process_function))
+    bullet.add_section(Section(mock_process_function))
+    assert "CUSTOM" in bullet.render()
+
+
+def test_bulletin_threaded_send_skip_unchanged():
+    transport = MemoryTransport()
+    bullet = Bulletin(transport,config={"subject":"Test"},cache=RenderCache())
+    bullet.add_section(Section(mock_process_function))
+    snapshot = bullet.snapshot()
+    threads = 8
+    barrier = threading.Barrier(threads)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(snapshot.send("test@example.com",skip_unchanged=True))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert sorted(results) == [False] * (threads - 1) + [True]
+    assert len(transport.messages) == 1
@@ -0,0 +1,16 @@
+from bulletin.cache import RenderCache
+import os
+
+
+def test_render_cache_prune(tmp_path):
+    cache = RenderCache(str(tmp_path),max_entries=10,max_disk_entries=3)
+    for i in range(5):
+        cache.set(f"fingerprint{i}",f"html {i}")
+        os.utime(tmp_path / f"fingerprint{i}.html",ns=(i * 10**9,i * 10**9))
+    cache.record_sent("key","fingerprint4")
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == ["fingerprint2.html","fingerprint3.html","fingerprint4.html","sent.json"]
+    reloaded = RenderCache(str(tmp_path),max_disk_entries=2)
+    assert reloaded.get("fingerprint2") is None
+    assert reloaded.get("fingerprint4") == "html 4"
+    assert reloaded.last_sent("key") == "fingerprint4"
@@ -0,0 +1,106 @@
+from bulletin.cli import main, load_bulletins
+import json
+import pytest
+import os
+import smtplib
+from bulletin.send_log import SendLog
+from bulletin.bulletin import Bulletin
+
+
+def test_cli_report(tmp_path,capsys):
+    path = str(tmp_path / "send.jsonl")
+    for run_id in ["run1","run2"]:
+        log = SendLog(path,run_id=run_id)
+        log.record(bulletin="daily",latency=0.1,bytes=100,retries=0,code=250,error=None)
+        log.record(bulletin="weekly",latency=0.2,bytes=100,retries=0,code=554,error="SMTPDataError")
+    assert main(["report",path,"--run","run2"]) == 0
+    out = capsys.readouterr().out
+    assert "run run2: 2 messages, 1 failed" in out
+    assert "run run1" not in out
+    assert "bulletin daily: 1 messages, 0 failed" in out
+    assert "SMTPDataError (554): 1" in out
+
+
+def test_cli_report_empty(tmp_path):
+    path = str(tmp_path / "send.jsonl")
+    SendLog(path,run_id="run1").record(bulletin="daily",latency=0.1)
+    assert main(["report",path,"--bulletin","weekly"]) == 1
+
+
+DEFINITIONS = """
+from bulletin import Bulletin, EmailServer, Section
+
+server = EmailServer("test@example.com","password1","example.example.com")
+
+def bulletins():
+    result = []
+    for name in ["daily","weekly"]:
+        bullet = Bulletin(server,config={"subject":name,"name":name,"recipients":"test@example.com"})
+        bullet.add_section(Section(lambda config: {"test":config["value"]},{"value":name}))
+        result.append(bullet)
+    return result
+"""
+
+
+def write_definitions(tmp_path) -> str:
+    path = tmp_path / "definitions.py"
+    path.write_text(DEFINITIONS)
+    return str(path)
+
+
+def test_load_bulletins(tmp_path,mock_get_smtp_server):
+    bulletins = load_bulletins(write_definitions(tmp_path))
+    assert [b.config["name"] for b in bulletins] == ["daily","weekly"]
+
+
+def test_cli_run_keeps_fetch_workers(tmp_path,mock_get_smtp_server,monkeypatch):
+    path = tmp_path / "definitions.py"
+    path.write_text(DEFINITIONS + "\nbulletins_list = bulletins()\nfor b in bulletins_list:\n    b.fetch_workers = 4\n")
+    seen = []
+    monkeypatch.setattr(Bulletin,"render",lambda self: seen.append(self.fetch_workers) or "")
+    assert main(["run",str(path),"--attribute","bulletins_list","--dry-run",str(tmp_path / "out")]) == 0
+    assert seen == [4,4]
+    seen.clear()
+    assert main(["run",str(path),"--attribute","bulletins_list","--dry-run",str(tmp_path / "out"),"--fetch-concurrency","2"]) == 0
+    assert seen == [2,2]
+
+
+def test_load_bulletins_rejects_snapshots(tmp_path,mock_get_smtp_server):
+    path = tmp_path / "definitions.py"
+    path.write_text(DEFINITIONS + "\nsnapshots = [b.snapshot() for b in bulletins()]\n")
+    with pytest.raises(TypeError):
+        load_bulletins(str(path),"snapshots")
+
+
+def test_cli_run_dry_run(tmp_path,mock_get_smtp_server):
+    out = tmp_path / "out"
+    profile = tmp_path / "profile"
+    assert main(["run",write_definitions(tmp_path),"--dry-run",str(out),"--workers","2","--fetch-concurrency","2","--profile",str(profile)]) == 0
+    assert "{'test': 'daily'}" in (out / "daily.html").read_text()
+    assert "{'test': 'weekly'}" in (out / "weekly.html").read_text()
+    assert (profile / "profile.pstats").exists()
+    timings = json.loads((profile / "timings.json").read_text())
+    assert [t["bulletin"] for t in timings["bulletins"]] == ["daily","weekly"]
+
+
+def test_cli_run_send(tmp_path,mock_get_smtp_server):
+    path = str(tmp_path / "send.jsonl")
+    args = ["run",write_definitions(tmp_path),"--send-log",path,"--cache-dir",str(tmp_path / "cache"),"--skip-unchanged"]
+    assert main(args) == 0
+    assert main(args) == 0
+    assert [r["bulletin"] for r in SendLog.read(path)] == ["daily","weekly"]
+
+
+def test_cli_run_skip_unchanged_needs_cache_dir(tmp_path):
+    with pytest.raises(SystemExit):
+        main(["run",write_definitions(tmp_path),"--skip-unchanged"])
+
+
+def test_cli_run_outbox(tmp_path,monkeypatch):
+    def no_smtp(*args,**kwargs):
+        raise AssertionError("Connected to an smtp server")
+
+    monkeypatch.setattr(smtplib,"SMTP",no_smtp)
+    outbox = tmp_path / "outbox"
+    assert main(["run",write_definitions(tmp_path),"--outbox",str(outbox),"--outbox-format","maildir"]) == 0
+    assert len(os.listdir(outbox / "new")) == 2
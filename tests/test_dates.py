@@ -0,0 +1,39 @@
+from bulletin.dates import *
+import datetime
+import dateutil.parser
+import pytest
+
+
+@pytest.mark.parametrize(("values","expected_format"),[
+    (["Wed, 19 Mar 2025 14:30:00 GMT","Tue, 18 Mar 2025 14:01:00 +0100","Wed, 19 Mar 2025 14:30:00 -0000"],"rfc822"),
+    (["2025-03-19T14:30:00Z","2025-03-18T14:01:00+01:00"],"iso8601"),
+    (["March 19, 2025 2:30 PM +0000","March 18, 2025 1:01 PM +0100"],"dateutil"),
+])
+def test_date_parser_formats(values,expected_format):
+    parser = DateParser()
+    for value in values:
+        parsed = parser.parse(value)
+        expected = dateutil.parser.parse(value)
+        assert parsed == expected
+        assert (parsed.tzinfo is None) == (expected.tzinfo is None)
+        assert parser.format == expected_format
+
+
+def test_date_parser_remembers_format(monkeypatch):
+    parser = DateParser()
+    parser.parse("2025-03-19T14:30:00Z")
+
+    def fail(value):
+        raise AssertionError("Tried a format that was not remembered")
+
+    monkeypatch.setitem(DateParser.FORMATS,"rfc822",fail)
+    assert parser.parse("2025-03-18T14:01:00Z") == datetime.datetime(2025,3,18,14,1,tzinfo=datetime.timezone.utc)
+
+
+def test_date_parser_format_change():
+    parser = DateParser()
+    parser.parse("2025-03-19T14:30:00Z")
+    assert parser.parse("Wed, 19 Mar 2025 14:30:00 GMT") == datetime.datetime(2025,3,19,14,30,tzinfo=datetime.timezone.utc)
+    assert parser.format == "rfc822"
+    with pytest.raises(ValueError):
+        parser.parse("not a date")
@@ -1,6 +1,7 @@
 from bulletin.email_server import EmailServer
 import pytest
 import smtplib
+from conftest import MockSmtp
 
 
     
@@ -18,4 +19,22 @@ def test_email_server_send(mock_get_smtp_server):
     server.send(recepient,subject,msg)
     assert server.server.sender == sender
     assert server.server.recepient == recepient
-    assert msg in server.server.msg
\ No newline at end of file
+    assert msg in server.server.msg
+
+
+def test_email_server_connects_lazily(monkeypatch):
+    connections = []
+
+    def mock_smtp(*args,**kwargs):
+        connections.append(args)
+        return MockSmtp(*args,**kwargs)
+
+    monkeypatch.setattr(smtplib,"SMTP",mock_smtp)
+    server = EmailServer("test@example.com","password1","example.example.com")
+    assert connections == []
+    server.send("testing@testing.com","Subject","Message")
+    server.send("testing@testing.com","Subject","Message")
+    assert connections == [("example.example.com",587)]
+    assert server.server.username == "test@example.com"
+    server.close()
+    server.close()
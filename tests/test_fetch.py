@@ -0,0 +1,157 @@
+from bulletin.fetch import *
+from bulletin.section import IndividualRSSFeed, RequestsGetSection
+import pytest
+import requests
+import json
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self,seconds):
+        self.now += seconds
+
+
+def failing_fetch(timeout):
+    raise HostError("Request Failed")
+
+
+def test_token_bucket_acquire():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_circuit_breaker_states():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_fetch_policy_passes_timeout():
+    policy = FetchPolicy(connect_timeout=1, read_timeout=2)
+    assert policy.fetch("http://example.com/a", lambda timeout: timeout) == (1,2)
+
+
+def test_fetch_policy_serves_stale_then_placeholder():
+    policy = FetchPolicy()
+    assert policy.fetch("http://example.com/a", lambda timeout: "fresh") == "fresh"
+    assert policy.fetch("http://example.com/a", failing_fetch, placeholder="none") == "fresh"
+    assert policy.fetch("http://example.com/b", failing_fetch, placeholder="none") == "none"
+
+
+def test_fetch_policy_fails_fast_when_open():
+    clock = FakeClock()
+    policy = FetchPolicy(failure_threshold=1, reset_timeout=10, clock=clock)
+    calls = []
+
+    def fetch(timeout):
+        calls.append(timeout)
+        return "fresh"
+
+    policy.fetch("http://example.com/a", failing_fetch)
+    assert policy.fetch("http://example.com/b", fetch, placeholder="none") == "none"
+    assert calls == []
+    assert policy.fetch("http://other.com/a", fetch) == "fresh"
+    clock.now = 10
+    assert policy.fetch("http://example.com/b", fetch) == "fresh"
+
+
+def test_fetch_policy_rate_limits_per_host():
+    clock = FakeClock()
+    policy = FetchPolicy(rate=1, burst=1, clock=clock)
+    for host in ["a.com","b.com","a.com"]:
+        bucket, _ = policy._host_state(host)
+        bucket._sleep = clock.sleep
+        policy.fetch(f"http://{host}/", lambda timeout: None)
+    assert clock.now == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(("section_class","expected"),[
+    (IndividualRSSFeed,{"title":"","items":[]}),
+    (RequestsGetSection,{}),
+])
+def test_section_fetch_failure_placeholder(section_class,expected,monkeypatch):
+    def mock_get(*args,**kwargs):
+        raise requests.ConnectionError("Connection refused")
+
+    monkeypatch.setattr(requests,"get",mock_get)
+    section = section_class("http://fetch_failure.com/test", fetch_policy=FetchPolicy())
+    assert section._process() == expected
+
+
+@pytest.mark.parametrize(("error","opens"),[
+    (HostError("Request Failed"),True),
+    (requests.ConnectionError("Connection refused"),True),
+    (requests.Timeout("Timed out"),True),
+    (ValueError("Nothing found at 'missing'"),False),
+    (json.JSONDecodeError("Expecting value","",0),False),
+])
+def test_fetch_policy_content_errors_leave_breaker(error,opens):
+    policy = FetchPolicy(failure_threshold=1)
+
+    def fetch(timeout):
+        raise error
+
+    assert policy.fetch("http://example.com/a",fetch,placeholder="none") == "none"
+    _, breaker = policy._host_state("example.com")
+    assert breaker.state == ("open" if opens else "closed")
+
+
+def test_circuit_breaker_trial_content_error():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1,reset_timeout=10,clock=clock)
+    breaker.record_failure()
+    breaker.record_response()
+    assert breaker.state == "open"
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_response()
+    assert breaker.state == "closed"
+
+
+def test_request_get_section_bad_json_path_keeps_host(mock_request_get):
+    policy = FetchPolicy(failure_threshold=1)
+    bad = RequestsGetSection("http://request_get_section_process.com/test",json_path="missing",fetch_policy=policy)
+    for _ in range(3):
+        assert bad._process() == {}
+    good = RequestsGetSection("http://request_get_section_process.com/test",fetch_policy=policy)
+    assert good._process() == {"test":"test"}
+
+
+def test_request_get_section_stale_per_return_type(mock_request_get, monkeypatch):
+    policy = FetchPolicy()
+    as_json = RequestsGetSection("http://request_get_section_process.com/test",fetch_policy=policy)
+    as_text = RequestsGetSection("http://request_get_section_process.com/test",return_type="text",fetch_policy=policy)
+    with_headers = RequestsGetSection("http://request_get_section_process.com/test",headers={"Accept":"text/plain"},return_type="text",fetch_policy=policy)
+    as_json._process()
+    as_text._process()
+
+    def failing_get(url,*args,**kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(requests,"get",failing_get)
+    assert as_json._process() == {"test":"test"}
+    assert isinstance(as_text._process(),str)
+    assert with_headers._process() == ""
@@ -5,6 +5,7 @@ from bulletin.email_server import EmailServer
 import pytest
 from conftest import mock_process_function
 import os
+import jinja2
 
 @pytest.mark.parametrize(("template","template_folder","kwargs","expected"),
                          [
@@ -42,4 +43,29 @@ def test_get_template_helper_bulletin(template,template_folder,kwargs,expected,m
     bullet.add_section(sect)
     renders = [section.render() for section in bullet.sections]
     template = get_template(bullet)
-    assert template.render(content=renders) == expect
\ No newline at end of file
+    assert template.render(content=renders) == expect
+
+def test_fingerprint_helper():
+    sect = Section(mock_process_function)
+    template = get_template(sect)
+    other_template = get_template(Section(mock_process_function,template="section.html",template_folder="templates_2"))
+    assert fingerprint({"a":1,"b":2},template) == fingerprint({"b":2,"a":1},template)
+    assert fingerprint({"a":1},template) != fingerprint({"a":2},template)
+    assert fingerprint({"a":1},template) != fingerprint({"a":1},other_template)
+
+
+def test_get_template_helper_reuses_environment():
+    assert get_template(Section(mock_process_function)) is get_template(Section(mock_process_function))
+
+
+def test_template_identity_follows_references(tmp_path):
+    (tmp_path / "base.html").write_text("{% block body %}{% endblock %}")
+    (tmp_path / "part.html").write_text("part")
+    (tmp_path / "page.html").write_text('{% extends "base.html" %}{% block body %}{% include "part.html" %}{% endblock %}')
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(str(tmp_path)))
+    template = environment.get_template("page.html")
+    before = template_identity(template)
+    assert str(tmp_path / "base.html") in before
+    assert str(tmp_path / "part.html") in before
+    (tmp_path / "part.html").write_text("changed part")
+    assert template_identity(template) != before
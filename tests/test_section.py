@@ -3,7 +3,9 @@ import pytest
 import json
 import datetime
 import os
+import requests
 from conftest import mock_process_function
+from markupsafe import Markup
 
 
 
@@ -85,6 +87,74 @@ def test_individual_rss_feed_process(mock_feedparser_parse):
     data = rss._process()
     with open(os.path.join("expected","individual_rss_process.json",)) as f:
         x = json.load(f)
-    for item in x["items"]:
-         item["pub_date"] = datetime.datetime.fromisoformat(item["pub_date"])
-    assert x == data
\ No newline at end of file
+    assert x["title"] == data["title"]
+    assert len(x["items"]) == len(data["items"])
+    for expected_item, item in zip(x["items"],data["items"]):
+         assert isinstance(item,FeedItem)
+         assert item.href == item["href"] == expected_item["href"]
+         assert item.title == item["title"] == expected_item["title"]
+         assert item.pub_date == datetime.datetime.fromisoformat(expected_item["pub_date"])
+
+
+def test_individual_rss_feed_relative_links(monkeypatch, tmp_path):
+    feed = '<rss version="2.0"><channel><title>Relative</title><item><title>Post</title><link>/post/1</link></item></channel></rss>'
+
+    class RelativeResponse:
+        status_code = 200
+        url = "https://relative.com/feed"
+        headers = {"content-type": "application/rss+xml"}
+        content = feed.encode()
+
+    monkeypatch.setattr(requests,"get",lambda url,*args,**kwargs: RelativeResponse())
+    data = IndividualRSSFeed("https://relative.com/feed")._process()
+    assert data["items"][0].href == "https://relative.com/post/1"
+
+    path = tmp_path / "feed.xml"
+    path.write_text(feed)
+    data = IndividualRSSFeed(str(path))._process()
+    assert data["title"] == "Relative"
+    assert data["items"][0].title == "Post"
+
+
+def test_individual_rss_feed_stale_per_items(mock_feedparser_parse, monkeypatch):
+    policy = FetchPolicy()
+    two = IndividualRSSFeed("http://test_individual_rss.com/feed",config={"items":2},fetch_policy=policy)
+    four = IndividualRSSFeed("http://test_individual_rss.com/feed",config={"items":4},fetch_policy=policy)
+    two._process()
+    four._process()
+
+    def failing_get(url,*args,**kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(requests,"get",failing_get)
+    assert len(two._process()["items"]) == 2
+    assert len(four._process()["items"]) == 4
+
+
+def test_feed_item():
+    item = FeedItem("http://test.com/1","Article 1","Wed, 19 Mar 2025 14:30:00 GMT")
+    assert not hasattr(item,"__dict__")
+    assert item._pub_date is None
+    assert item["pub_date"] == datetime.datetime(2025,3,19,14,30,tzinfo=datetime.timezone.utc)
+    assert item._pub_date is not None
+    assert FeedItem("http://test.com/1","Article 1").pub_date is None
+    with pytest.raises(KeyError):
+        item["published_parsed"]
+
+def test_static_section_render():
+    calls = []
+
+    def process(config):
+        calls.append(config)
+        return config["value"]
+
+    config = {"value":"first"}
+    sect = Section(process,config,static=True)
+    first = sect.render()
+    config["value"] = "second"
+    assert sect.render() is first
+    assert isinstance(first,Markup)
+    assert first == "first"
+    assert len(calls) == 1
+    assert PlainTextSection("test").static
+    assert not Section(mock_process_function).static
@@ -0,0 +1,96 @@
+from bulletin.send_log import *
+from bulletin.email_server import EmailServer
+from bulletin.bulletin import Bulletin
+from bulletin.section import Section
+from conftest import mock_process_function
+import smtplib
+import time
+import pytest
+
+
+def test_send_log_record(tmp_path):
+    path = str(tmp_path / "logs" / "send.jsonl")
+    log = SendLog(path,run_id="run1")
+    log.record(bulletin="daily",latency=0.5)
+    log.record(bulletin="weekly",latency=0.25)
+    records = SendLog.read(path)
+    assert [r["bulletin"] for r in records] == ["daily","weekly"]
+    assert all(r["run_id"] == "run1" for r in records)
+
+
+def test_email_server_send_log(tmp_path,mock_get_smtp_server):
+    path = str(tmp_path / "send.jsonl")
+    server = EmailServer("test@example.com","password1","example.example.com",send_log=SendLog(path))
+    bullet = Bulletin(server,config={"subject":"Test","name":"daily"})
+    bullet.add_section(Section(mock_process_function))
+    bullet.send(["a@example.com","b@example.com"])
+    record, = SendLog.read(path)
+    assert record["bulletin"] == "daily"
+    assert record["recipients"] == 2
+    assert record["code"] == 250
+    assert record["retries"] == 0
+    assert record["error"] is None
+    assert record["bytes"] > 0
+
+
+def test_email_server_send_log_retries(tmp_path,mock_get_smtp_server,monkeypatch):
+    path = str(tmp_path / "send.jsonl")
+    server = EmailServer("test@example.com","password1","example.example.com",send_log=SendLog(path),max_retries=2,retry_delay=0.5)
+    attempts = []
+    delays = []
+    monkeypatch.setattr(time,"sleep",delays.append)
+
+    def sendmail(sender,recepient,msg):
+        attempts.append(msg)
+        raise smtplib.SMTPDataError(451,"Try again later")
+
+    server.server.sendmail = sendmail
+    with pytest.raises(smtplib.SMTPDataError):
+        server.send("a@example.com","Test","Text")
+    record, = SendLog.read(path)
+    assert len(attempts) == 3
+    assert delays == [0.5,1.0]
+    assert record["retries"] == 2
+    assert record["code"] == 451
+    assert record["error"] == "SMTPDataError"
+
+
+def test_percentile():
+    values = list(range(1,101))
+    assert percentile(values,50) == 50
+    assert percentile(values,99) == 99
+    assert percentile([3.0],95) == 3.0
+    assert percentile([],50) is None
+
+
+def test_summarize():
+    records = [
+        {"run_id":"a","timestamp":0.0,"latency":0.5,"bytes":10,"retries":0,"error":None,"code":250},
+        {"run_id":"a","timestamp":0.5,"latency":0.5,"bytes":10,"retries":1,"error":None,"code":250},
+        {"run_id":"a","timestamp":1.0,"latency":1.0,"bytes":10,"retries":0,"error":"SMTPDataError","code":554},
+        {"run_id":"a","timestamp":1.5,"latency":0.5,"bytes":10,"retries":0,"error":None,"code":250},
+    ]
+    summary = summarize(records)
+    assert summary["messages"] == 4
+    assert summary["failures"] == 1
+    assert summary["retries"] == 1
+    assert summary["bytes"] == 40
+    assert summary["per_second"] == pytest.approx(2.0)
+    assert summary["p50"] == 0.5
+    assert summary["p99"] == 1.0
+    assert summary["errors"] == {"SMTPDataError (554)":1}
+
+
+def test_email_server_send_log_os_error(tmp_path,mock_get_smtp_server):
+    path = str(tmp_path / "send.jsonl")
+    server = EmailServer("test@example.com","password1","example.example.com",send_log=SendLog(path))
+
+    def sendmail(sender,recepient,msg):
+        raise TimeoutError("timed out")
+
+    server.server.sendmail = sendmail
+    with pytest.raises(TimeoutError):
+        server.send("a@example.com","Test","Text")
+    record, = SendLog.read(path)
+    assert record["code"] is None
+    assert record["error"] == "TimeoutError"
@@ -0,0 +1,63 @@
+from bulletin import streaming
+from bulletin.streaming import *
+from bulletin.section import RequestsGetSection
+from bulletin.fetch import FetchPolicy
+import pytest
+
+DOCUMENT = b'{"meta": {"count": 2}, "results": [{"title": "a", "score": 1.5}, {"title": "b", "score": 2}]}'
+
+
+def chunks(data,size=7):
+    return [data[i:i + size] for i in range(0,len(data),size)]
+
+
+def test_limited_reader():
+    reader = LimitedReader(chunks(b"0123456789"))
+    assert reader.read(3) == b"012"
+    assert reader.read(10) == b"3456789"
+    assert reader.read() == b""
+    assert LimitedReader(chunks(b"0123456789"),max_bytes=10).read() == b"0123456789"
+    with pytest.raises(ResponseTooLarge):
+        LimitedReader(chunks(b"0123456789"),max_bytes=9).read()
+
+
+@pytest.mark.parametrize(("path","expected"),[
+    ("",{"meta":{"count":2},"results":[{"title":"a","score":1.5},{"title":"b","score":2}]}),
+    ("meta.count",2),
+    ("results.item.title",["a","b"]),
+    ("results.item",[{"title":"a","score":1.5},{"title":"b","score":2}]),
+    ("missing.item",[]),
+])
+@pytest.mark.parametrize("use_ijson",[True,False])
+def test_load_json(path,expected,use_ijson,monkeypatch):
+    if use_ijson:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(streaming,"ijson",None)
+    assert load_json(LimitedReader(chunks(DOCUMENT)),path) == expected
+
+
+@pytest.mark.parametrize("use_ijson",[True,False])
+def test_load_json_missing(use_ijson,monkeypatch):
+    if use_ijson:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(streaming,"ijson",None)
+    with pytest.raises(ValueError):
+        load_json(LimitedReader(chunks(DOCUMENT)),"meta.missing")
+
+
+def test_load_json_stops_reading():
+    pytest.importorskip("ijson")
+    reader = LimitedReader(chunks(DOCUMENT + b" " * 1000000,size=1024),max_bytes=64 * 1024)
+    assert load_json(reader,"meta.count") == 2
+
+
+def test_request_get_section_json_path(mock_request_get):
+    section = RequestsGetSection("http://request_get_section_process.com/test",json_path="test",fetch_policy=FetchPolicy())
+    assert section._process() == "test"
+
+
+def test_request_get_section_max_bytes(mock_request_get):
+    section = RequestsGetSection("http://request_get_section_process.com/test",max_bytes=5,fetch_policy=FetchPolicy())
+    assert section._process() == {}
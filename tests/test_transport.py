@@ -0,0 +1,68 @@
+from bulletin.transport import *
+from bulletin.bulletin import Bulletin
+from bulletin.section import Section
+from bulletin.send_log import SendLog
+from bulletin.cache import RenderCache
+from conftest import mock_process_function
+import email
+import os
+import pytest
+
+
+def test_memory_transport(tmp_path):
+    path = str(tmp_path / "send.jsonl")
+    transport = MemoryTransport(send_log=SendLog(path))
+    bullet = Bulletin(transport,config={"subject":"Test"})
+    bullet.add_section(Section(mock_process_function))
+    bullet.send(["a@example.com","b@example.com"])
+    message, = transport.messages
+    assert message["to"] == ["a@example.com","b@example.com"]
+    parsed = email.message_from_string(message["message"])
+    assert parsed["Subject"] == "Test"
+    assert parsed["From"] == DEFAULT_SENDER
+    assert parsed["To"] == "a@example.com, b@example.com"
+    record, = SendLog.read(path)
+    assert record["code"] is None
+    assert record["error"] is None
+
+
+def test_file_transport_eml(tmp_path):
+    with FileTransport(str(tmp_path)) as transport:
+        for subject in ["First","Second","Third"]:
+            transport.send("a@example.com",subject,subject.lower())
+            assert len(os.listdir(tmp_path)) == ["First","Second","Third"].index(subject) + 1
+    files = os.listdir(tmp_path)
+    assert all(f.endswith(".eml") for f in files)
+    subjects = set()
+    for f in files:
+        with open(tmp_path / f) as eml:
+            subjects.add(email.message_from_file(eml)["Subject"])
+    assert subjects == {"First","Second","Third"}
+
+
+def test_file_transport_skip_unchanged(tmp_path):
+    outbox = tmp_path / "outbox"
+    bullet = Bulletin(FileTransport(str(outbox)),cache=RenderCache())
+    bullet.add_section(Section(mock_process_function))
+    assert bullet.send("a@example.com",skip_unchanged=True)
+    assert len(os.listdir(outbox)) == 1
+    assert not bullet.send("a@example.com",skip_unchanged=True)
+    assert len(os.listdir(outbox)) == 1
+
+
+def test_file_transport_maildir(tmp_path):
+    transport = FileTransport(str(tmp_path),format="maildir")
+    transport.send("a@example.com","First","first")
+    assert sorted(os.listdir(tmp_path)) == ["cur","new","tmp"]
+    assert len(os.listdir(tmp_path / "new")) == 1
+    assert os.listdir(tmp_path / "tmp") == []
+
+
+def test_file_transport_format(tmp_path):
+    with pytest.raises(ValueError):
+        FileTransport(str(tmp_path),format="mbox")
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        Transport()